@@ -9,18 +9,12 @@ import sqlite3
 import warnings
 from contextlib import contextmanager
 from dataclasses import dataclass
+from decimal import Decimal
 from pathlib import Path
-from typing import Iterator, Optional
+from typing import TYPE_CHECKING, Iterator, Optional
 
-# Suppress SQLAlchemy warnings from piecash's relationship mappings.
-# These warnings are about overlapping relationships in piecash's models
-# and are not actionable by gcg users.
-from sqlalchemy.exc import SAWarning
-
-warnings.filterwarnings("ignore", category=SAWarning)
-
-from piecash import open_book
-from piecash.core.book import Book
+if TYPE_CHECKING:
+    from piecash.core.book import Book
 
 
 class BookOpenError(Exception):
@@ -119,7 +113,7 @@ def get_transaction_notes(
 @contextmanager
 def open_gnucash_book(
     path: Path, check_notes: bool = True
-) -> Iterator[tuple[Book, BookInfo]]:
+) -> Iterator[tuple["Book", BookInfo]]:
     """
     Open a GnuCash book in read-only mode.
 
@@ -152,6 +146,17 @@ def open_gnucash_book(
     if check_notes:
         has_notes_column, has_slots_notes = check_notes_support(path)
 
+    # piecash pulls in SQLAlchemy, which adds a few hundred milliseconds
+    # to startup, so load it only when a book is actually opened.
+    # Suppress SQLAlchemy warnings from piecash's relationship mappings
+    # first: they are about overlapping relationships in piecash's models
+    # and are not actionable by gcg users.
+    from sqlalchemy.exc import SAWarning
+
+    warnings.filterwarnings("ignore", category=SAWarning)
+
+    from piecash import open_book
+
     try:
         # Open with piecash in read-only mode
         # piecash uses SQLAlchemy which opens read-only via readonly=True
@@ -191,8 +196,23 @@ def get_account_full_name(account) -> str:
     return account.fullname
 
 
+def get_split_value(split) -> Decimal:
+    """
+    Get a split's value as a Decimal.
+
+    piecash already returns Decimal values, so these are passed through
+    unchanged; anything else is converted via its string form.
+    """
+    value = split.value
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, int):
+        return Decimal(value)
+    return Decimal(str(value))
+
+
 def get_account_by_pattern(
-    book: Book,
+    book: "Book",
     pattern: str,
     is_regex: bool = False,
     case_sensitive: bool = False,
@@ -254,9 +274,17 @@ def get_account_by_pattern(
     return list(result_set)
 
 
+def connect_readonly(db_path: Path) -> sqlite3.Connection:
+    """Open a read-only SQLite connection to a GnuCash book file."""
+    return sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+
+
 def get_transaction_notes_batch(
-    db_path: Path, tx_guids: list[str], has_notes_column: bool
-) -> dict[str, Optional[str]]:
+    db_path: Path,
+    tx_guids: list[str],
+    has_notes_column: bool,
+    conn: Optional[sqlite3.Connection] = None,
+) -> dict[str, str]:
     """
     Get notes for multiple transactions in a single query.
 
@@ -264,44 +292,53 @@ def get_transaction_notes_batch(
         db_path: Path to the GnuCash SQLite file
         tx_guids: List of transaction GUIDs to fetch notes for
         has_notes_column: Whether notes are in transactions table
+        conn: Open connection to the book to reuse (from
+            connect_readonly); by default one is opened for this call
 
     Returns:
-        Dictionary mapping tx_guid to notes (or None if no notes)
+        Dictionary mapping tx_guid to notes, for transactions that have
+        notes. Empty if the query fails on a connection opened here.
+
+    Raises:
+        sqlite3.Error: If the query fails on a passed-in connection, so
+            that callers caching the result can tell failure from no notes
     """
     if not tx_guids:
         return {}
 
-    uri = f"file:{db_path}?mode=ro"
-    result = {}
+    if conn is not None:
+        return _query_notes(conn, tx_guids, has_notes_column)
 
     try:
-        conn = sqlite3.connect(uri, uri=True)
-        cursor = conn.cursor()
+        conn = connect_readonly(db_path)
+        try:
+            return _query_notes(conn, tx_guids, has_notes_column)
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return {}
 
-        # Build placeholders for IN clause
-        placeholders = ",".join("?" * len(tx_guids))
 
-        if has_notes_column:
-            cursor.execute(
-                f"SELECT guid, notes FROM transactions "
-                f"WHERE guid IN ({placeholders})",
-                tx_guids,
-            )
-        else:
-            cursor.execute(
-                f"SELECT obj_guid, string_val FROM slots "
-                f"WHERE obj_guid IN ({placeholders}) AND name = 'notes'",
-                tx_guids,
-            )
+def _query_notes(
+    conn: sqlite3.Connection, tx_guids: list[str], has_notes_column: bool
+) -> dict[str, str]:
+    """Query notes for tx_guids, keeping only transactions with notes."""
+    cursor = conn.cursor()
 
-        for row in cursor.fetchall():
-            guid, notes = row
-            if notes:
-                result[guid] = notes
+    # Build placeholders for IN clause
+    placeholders = ",".join("?" * len(tx_guids))
 
-        conn.close()
-
-    except sqlite3.Error:
-        pass
+    if has_notes_column:
+        cursor.execute(
+            f"SELECT guid, notes FROM transactions "
+            f"WHERE guid IN ({placeholders})",
+            tx_guids,
+        )
+    else:
+        cursor.execute(
+            f"SELECT obj_guid, string_val FROM slots "
+            f"WHERE obj_guid IN ({placeholders}) AND name = 'notes'",
+            tx_guids,
+        )
 
-    return result
+    return {guid: notes for guid, notes in cursor.fetchall() if notes}
@@ -12,6 +12,28 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
 
+# Search statements are fixed strings with every value bound (LIMIT -1
+# means no limit), so repeated searches reuse sqlite3's compiled
+# statement cache instead of re-parsing the SQL.
+_SEARCH_FTS_SQL = """
+    SELECT s.*
+    FROM splits s
+    JOIN splits_fts fts ON s.split_guid = fts.split_guid
+    WHERE splits_fts MATCH ?
+    ORDER BY s.tx_date DESC
+    LIMIT ?
+"""
+
+_SEARCH_LIKE_SQL = """
+    SELECT *
+    FROM splits
+    WHERE description_lower LIKE ?
+       OR memo_lower LIKE ?
+       OR account_name_lower LIKE ?
+    ORDER BY tx_date DESC
+    LIMIT ?
+"""
+
 
 class CacheManager:
     """
@@ -35,6 +57,8 @@ class CacheManager:
         """
         self.cache_path = Path(cache_path)
         self.book_path = Path(book_path)
+        # Opened on the first search and reused by later ones
+        self._search_conn: Optional[sqlite3.Connection] = None
 
     def status(self) -> dict[str, Any]:
         """
@@ -191,11 +215,18 @@ class CacheManager:
         Returns:
             True if cache was deleted, False if it didn't exist
         """
+        self.close()
         if self.cache_path.exists():
             os.remove(self.cache_path)
             return True
         return False
 
+    def close(self) -> None:
+        """Close the connection kept open for searches, if any."""
+        if self._search_conn is not None:
+            self._search_conn.close()
+            self._search_conn = None
+
     def search(
         self,
         text: str,
@@ -216,46 +247,23 @@ class CacheManager:
         if not self.cache_path.exists():
             raise ValueError("Cache does not exist. Run 'gcg cache build'.")
 
-        conn = sqlite3.connect(str(self.cache_path))
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        try:
-            if use_fts:
-                # Use FTS5 for fast search
-                query = """
-                    SELECT s.*
-                    FROM splits s
-                    JOIN splits_fts fts ON s.split_guid = fts.split_guid
-                    WHERE splits_fts MATCH ?
-                    ORDER BY s.tx_date DESC
-                """
-                params: list = [text]
-                if limit:
-                    query += " LIMIT ?"
-                    params.append(limit)
-                cursor.execute(query, params)
-            else:
-                # Fall back to LIKE search
-                pattern = f"%{text.lower()}%"
-                query = """
-                    SELECT *
-                    FROM splits
-                    WHERE description_lower LIKE ?
-                       OR memo_lower LIKE ?
-                       OR account_name_lower LIKE ?
-                    ORDER BY tx_date DESC
-                """
-                params = [pattern, pattern, pattern]
-                if limit:
-                    query += " LIMIT ?"
-                    params.append(limit)
-                cursor.execute(query, params)
-
-            return [dict(row) for row in cursor.fetchall()]
+        conn = self._search_conn
+        if conn is None:
+            conn = self._search_conn = sqlite3.connect(str(self.cache_path))
+            conn.row_factory = sqlite3.Row
+
+        row_limit = limit or -1
+        if use_fts:
+            # Use FTS5 for fast search
+            cursor = conn.execute(_SEARCH_FTS_SQL, (text, row_limit))
+        else:
+            # Fall back to LIKE search
+            pattern = f"%{text.lower()}%"
+            cursor = conn.execute(
+                _SEARCH_LIKE_SQL, (pattern, pattern, pattern, row_limit)
+            )
 
-        finally:
-            conn.close()
+        return [dict(row) for row in cursor.fetchall()]
 
     def _create_schema(self, cursor: sqlite3.Cursor) -> None:
         """Create the cache database schema."""
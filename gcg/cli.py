@@ -5,10 +5,13 @@ Provides the main entry point and argument parsing for all commands.
 """
 
 import argparse
+import heapq
 import re
 import sys
 from datetime import date, datetime, timedelta
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from operator import attrgetter
 from typing import Optional
 
 from gcg import __version__
@@ -16,6 +19,7 @@ from gcg.book import (
     BookOpenError,
     InvalidPatternError,
     get_account_by_pattern,
+    get_split_value,
     get_transaction_notes,
     get_transaction_notes_batch,
     open_gnucash_book,
@@ -33,10 +37,19 @@ from gcg.output import (
     TransactionRow,
 )
 
+# Shared so date arithmetic does not build a new timedelta per call
+_ONE_DAY = timedelta(days=1)
 
+
+@lru_cache(maxsize=256)
 def parse_date(date_str: str) -> date:
     """Parse a date string in YYYY-MM-DD format."""
     try:
+        # Zero-padded dates take the C fromisoformat path; anything else
+        # (such as 2026-1-5) is left to strptime. The shape check keeps
+        # newer Pythons' wider ISO 8601 forms (2026-W03-4) out.
+        if len(date_str) == 10 and date_str[4] == date_str[7] == "-":
+            return date.fromisoformat(date_str)
         return datetime.strptime(date_str, "%Y-%m-%d").date()
     except ValueError as e:
         raise argparse.ArgumentTypeError(
@@ -44,6 +57,7 @@ def parse_date(date_str: str) -> date:
         ) from e
 
 
+@lru_cache(maxsize=256)
 def parse_date_range(range_str: str) -> tuple[Optional[date], Optional[date]]:
     """
     Parse a date range string like 'A..B', 'A..', or '..B'.
@@ -51,13 +65,13 @@ def parse_date_range(range_str: str) -> tuple[Optional[date], Optional[date]]:
     Returns (start_date, end_date) where either may be None.
     For --date semantics, both start and end are inclusive.
     """
-    if ".." not in range_str:
+    # partition() finds the separator and splits in a single scan
+    start_str, sep, end_str = range_str.partition("..")
+    if not sep:
         raise argparse.ArgumentTypeError(
             f"Invalid date range: {range_str}. Use format A..B, A.., or ..B"
         )
-
-    parts = range_str.split("..", 1)
-    start_str, end_str = parts[0].strip(), parts[1].strip()
+    start_str, end_str = start_str.strip(), end_str.strip()
 
     start_date = parse_date(start_str) if start_str else None
     end_date = parse_date(end_str) if end_str else None
@@ -65,6 +79,7 @@ def parse_date_range(range_str: str) -> tuple[Optional[date], Optional[date]]:
     return (start_date, end_date)
 
 
+@lru_cache(maxsize=256)
 def parse_amount_range(
     range_str: str,
 ) -> tuple[Optional[Decimal], Optional[Decimal]]:
@@ -73,14 +88,13 @@ def parse_amount_range(
 
     Returns (min_amount, max_amount) where either may be None.
     """
-    if ".." not in range_str:
+    min_str, sep, max_str = range_str.partition("..")
+    if not sep:
         raise argparse.ArgumentTypeError(
             f"Invalid amount range: {range_str}. "
             f"Use format MIN..MAX, MIN.., or ..MAX"
         )
-
-    parts = range_str.split("..", 1)
-    min_str, max_str = parts[0].strip(), parts[1].strip()
+    min_str, max_str = min_str.strip(), max_str.strip()
 
     try:
         min_amount = Decimal(min_str) if min_str else None
@@ -94,7 +108,18 @@ def parse_amount_range(
 
 
 def create_parser() -> argparse.ArgumentParser:
-    """Create the main argument parser."""
+    """
+    Return the main argument parser.
+
+    The parser is built on first use and shared afterwards; parse_args
+    does not modify it, so callers must not either.
+    """
+    return _build_parser()
+
+
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the main argument parser."""
     parser = argparse.ArgumentParser(
         prog="gcg",
         description="Grep-like search and reporting for GnuCash SQLite books",
@@ -373,7 +398,7 @@ def resolve_date_filters(args) -> tuple[Optional[date], Optional[date]]:
             after_date = range_start
         if range_end:
             # --date end is inclusive, so add 1 day for before
-            before_date = range_end + timedelta(days=1)
+            before_date = range_end + _ONE_DAY
 
     return (after_date, before_date)
 
@@ -392,28 +417,36 @@ def _prune_to_matching_paths(matching_accounts: list, book) -> list:
     Returns:
         List of accounts to display (ancestors + matches + descendants)
     """
+    all_accounts = [
+        a for a in book.accounts if a.type not in ("ROOT", "TRADING")
+    ]
     matching_set = set(matching_accounts)
     result_set = set(matching_accounts)
 
-    # Add all ancestors of matching accounts
+    # Add all ancestors of matching accounts, stopping at any ancestor
+    # whose own chain has already been walked
+    walked = set()
     for acc in matching_accounts:
         parent = acc.parent
-        while parent is not None:
+        while parent is not None and parent not in walked:
+            walked.add(parent)
             if parent.type not in ("ROOT", "TRADING"):
                 result_set.add(parent)
             parent = parent.parent
 
-    # Add all descendants of matching accounts
-    all_accounts = [
-        a for a in book.accounts if a.type not in ("ROOT", "TRADING")
-    ]
+    # Add all descendants of matching accounts: index children by parent
+    # once, then walk down from each match
+    children: dict = {}
     for acc in all_accounts:
-        parent = acc.parent
-        while parent is not None:
-            if parent in matching_set:
-                result_set.add(acc)
-                break
-            parent = parent.parent
+        children.setdefault(acc.parent, []).append(acc)
+    below_match = set(matching_set)
+    stack = list(matching_set)
+    while stack:
+        for child in children.get(stack.pop(), ()):
+            if child not in below_match:
+                below_match.add(child)
+                stack.append(child)
+    result_set |= below_match
 
     return list(result_set)
 
@@ -467,11 +500,7 @@ def cmd_accounts(args, config: Config) -> int:
                     )
                 )
 
-            # Apply limit/offset
-            if args.offset:
-                rows = rows[args.offset :]
-            if args.limit:
-                rows = rows[: args.limit]
+            rows = _paginate(rows, args.offset, args.limit)
 
             formatter = OutputFormatter(
                 format_type=args.format,
@@ -511,7 +540,8 @@ def cmd_grep(args, config: Config) -> int:
 
     try:
         with open_gnucash_book(config.resolve_book_path()) as (book, info):
-            # Filter accounts if specified
+            # Filter accounts if specified; only the splits of these
+            # accounts are visited below
             if args.account:
                 try:
                     accounts = get_account_by_pattern(
@@ -524,14 +554,12 @@ def cmd_grep(args, config: Config) -> int:
                 except InvalidPatternError as e:
                     print(f"Error: {e}", file=sys.stderr)
                     return 2
-                account_set = set(accounts)
             else:
                 accounts = [
                     a
                     for a in book.accounts
                     if a.type not in ("ROOT", "TRADING")
                 ]
-                account_set = None
 
             # Check notes support
             notes_supported = info.has_notes_column or info.has_slots_notes
@@ -543,97 +571,83 @@ def cmd_grep(args, config: Config) -> int:
                 )
                 search_fields.discard("notes")
 
-            # Pre-fetch all notes if we need to search them
-            notes_map: dict[str, str] = {}
-            if search_notes:
-                all_tx_guids = set()
-                for acc in accounts:
-                    for split in acc.splits:
-                        all_tx_guids.add(split.transaction.guid)
-                notes_map = get_transaction_notes_batch(
-                    config.resolve_book_path(),
-                    list(all_tx_guids),
-                    info.has_notes_column,
-                )
-
-            # Collect matching splits
-            matching_splits = []
-            seen_tx_guids = set()
+            # Apply the cheap filters first, so notes are only fetched
+            # for transactions that can still match
+            candidates = []
+            min_amt, max_amt = amount_range
+            signed = args.signed
+            # Open date bounds become date.min/date.max so each split
+            # needs a single chained comparison
+            start_date = after_date or date.min
+            end_date = before_date or date.max
 
             for acc in accounts:
                 for split in acc.splits:
                     tx = split.transaction
 
-                    # Account filter
-                    if account_set and split.account not in account_set:
-                        continue
-
                     # Date filter
-                    tx_date = tx.post_date
-                    if after_date and tx_date < after_date:
-                        continue
-                    if before_date and tx_date >= before_date:
+                    if not start_date <= tx.post_date < end_date:
                         continue
 
                     # Amount filter
-                    split_value = Decimal(str(split.value))
-                    if not args.signed:
-                        split_value = abs(split_value)
-                    min_amt, max_amt = amount_range
+                    split_value = get_split_value(split)
+                    if not signed and split_value.is_signed():
+                        split_value = -split_value
                     if min_amt is not None and split_value < min_amt:
                         continue
                     if max_amt is not None and split_value > max_amt:
                         continue
 
-                    # Text search
-                    searchable = ""
-                    if "desc" in search_fields:
-                        searchable += tx.description + " "
-                    if "memo" in search_fields:
-                        searchable += (split.memo or "") + " "
-                    if search_notes:
-                        notes = notes_map.get(tx.guid, "")
-                        if notes:
-                            searchable += notes + " "
-
-                    if not pattern.search(searchable):
-                        continue
+                    candidates.append((split, tx, acc))
+
+            notes_map: dict[str, str] = {}
+            if search_notes and candidates:
+                notes_map = get_transaction_notes_batch(
+                    config.resolve_book_path(),
+                    list({tx.guid for _, tx, _ in candidates}),
+                    info.has_notes_column,
+                )
 
-                    # Deduplication
-                    if args.dedupe == "tx" or args.full_tx:
-                        if tx.guid in seen_tx_guids:
-                            continue
-                        seen_tx_guids.add(tx.guid)
+            # Text search over the remaining candidates
+            matching_splits = []
+            first_split_per_tx = {}
+            search_desc = "desc" in search_fields
+            search_memo = "memo" in search_fields
+            search = pattern.search
+            dedupe_tx = args.dedupe == "tx" or args.full_tx
+
+            for split, tx, acc in candidates:
+                # Match each selected field separately; stop at the first hit
+                if not (
+                    (search_desc and search(tx.description))
+                    or (search_memo and split.memo and search(split.memo))
+                    or (
+                        search_notes
+                        and tx.guid in notes_map
+                        and search(notes_map[tx.guid])
+                    )
+                ):
+                    continue
 
+                # Deduplication keeps the first matching split per tx
+                if dedupe_tx:
+                    first_split_per_tx.setdefault(tx.guid, (split, tx, acc))
+                else:
                     matching_splits.append((split, tx, acc))
 
+            if dedupe_tx:
+                matching_splits = list(first_split_per_tx.values())
+
             if not matching_splits:
                 return 1  # No matches
 
             # Format output
             full_account = getattr(args, "full_account", False)
-            rows = _splits_to_rows(
-                matching_splits,
-                config,
-                info,
-                args,
-                notes_map=notes_map,
-                full_account=full_account,
-            )
-
-            # Sort
-            rows = _sort_rows(rows, args.sort, args.reverse)
-
-            # Limit/offset
-            if args.offset:
-                rows = rows[args.offset :]
-            if args.limit:
-                rows = rows[: args.limit]
-
             formatter = OutputFormatter(
                 format_type=args.format,
                 show_header=not args.no_header,
                 include_notes=search_notes,
+                include_original=args.also_original,
             )
 
             if args.full_tx:
@@ -646,8 +660,25 @@ def cmd_grep(args, config: Config) -> int:
                     full_account=full_account,
                 )
                 formatter.format_transactions(tx_rows)
-            else:
-                formatter.format_splits(rows)
+                return 0
+
+            # Split rows (and their currency conversion) are only needed
+            # for the split listing
+            rows = _splits_to_rows(
+                matching_splits,
+                config,
+                info,
+                args,
+                notes_map=notes_map,
+                full_account=full_account,
+            )
+
+            # Sort; only rows up to the end of the requested page are needed
+            page_end = _page_end(args.offset, args.limit)
+            rows = _sort_rows(rows, args.sort, args.reverse, page_end)
+
+            rows = _paginate(rows, args.offset, args.limit)
+            formatter.format_splits(rows)
 
             return 0
 
@@ -684,22 +715,24 @@ def cmd_ledger(args, config: Config) -> int:
 
             splits_data = []
             tx_guids_for_notes = set()
+            signed = args.signed
+            # Open date bounds become date.min/date.max so each split
+            # needs a single chained comparison
+            start_date = after_date or date.min
+            end_date = before_date or date.max
 
             for acc in accounts:
                 for split in acc.splits:
                     tx = split.transaction
 
                     # Date filter
-                    tx_date = tx.post_date
-                    if after_date and tx_date < after_date:
-                        continue
-                    if before_date and tx_date >= before_date:
+                    if not start_date <= tx.post_date < end_date:
                         continue
 
                     # Amount filter
-                    split_value = Decimal(str(split.value))
-                    if not args.signed:
-                        split_value = abs(split_value)
+                    split_value = get_split_value(split)
+                    if not signed and split_value.is_signed():
+                        split_value = -split_value
                     min_amt, max_amt = amount_range
                     if min_amt is not None and split_value < min_amt:
                         continue
@@ -728,16 +761,16 @@ def cmd_ledger(args, config: Config) -> int:
                 notes_map=notes_map,
                 full_account=full_account,
             )
-            rows = _sort_rows(rows, args.sort, args.reverse)
+            # Only rows up to the end of the requested page are needed
+            page_end = _page_end(args.offset, args.limit)
+            rows = _sort_rows(rows, args.sort, args.reverse, page_end)
 
-            if args.offset:
-                rows = rows[args.offset :]
-            if args.limit:
-                rows = rows[: args.limit]
+            rows = _paginate(rows, args.offset, args.limit)
 
             formatter = OutputFormatter(
                 format_type=args.format,
                 show_header=not args.no_header,
+                include_original=args.also_original,
             )
             formatter.format_splits(rows)
             return 0
@@ -778,7 +811,7 @@ def cmd_tx(args, config: Config) -> int:
                         account=_account_name(acc.fullname, full_account),
                         memo=split.memo,
                         notes=notes,
-                        amount=Decimal(str(split.value)),
+                        amount=get_split_value(split),
                         currency=(
                             acc.commodity.mnemonic if acc.commodity else ""
                         ),
@@ -799,6 +832,7 @@ def cmd_tx(args, config: Config) -> int:
             formatter = OutputFormatter(
                 format_type=args.format,
                 show_header=not args.no_header,
+                include_original=False,
             )
             formatter.format_transactions([tx_row])
             return 0
@@ -843,7 +877,7 @@ def cmd_split(args, config: Config) -> int:
                 account=_account_name(found_acc.fullname, full_account),
                 memo=found_split.memo,
                 notes=notes,
-                amount=Decimal(str(found_split.value)),
+                amount=get_split_value(found_split),
                 currency=(
                     found_acc.commodity.mnemonic if found_acc.commodity else ""
                 ),
@@ -855,6 +889,7 @@ def cmd_split(args, config: Config) -> int:
             formatter = OutputFormatter(
                 format_type=args.format,
                 show_header=not args.no_header,
+                include_original=False,
             )
             formatter.format_splits([row])
             return 0
@@ -952,25 +987,19 @@ def _splits_to_rows(
 ) -> list[SplitRow]:
     """Convert split/tx/acc tuples to SplitRow objects."""
     rows = []
-    converter = CurrencyConverter(
-        config.resolve_book_path(),
-        base_currency=getattr(args, "base_currency", None)
-        or config.base_currency,
-        lookback_days=getattr(args, "fx_lookback", None)
-        or config.fx_lookback_days,
-    )
-
     currency_mode = getattr(args, "currency", "auto")
     also_original = getattr(args, "also_original", False)
     signed = getattr(args, "signed", False)
 
     # Determine target currency
-    account_currencies = get_account_currencies(
-        [acc for _, _, acc in splits_data]
-    )
+    # Unzip once for the currency checks; accounts repeat across splits,
+    # so each distinct account is inspected once
+    splits, _, accounts = zip(*splits_data) if splits_data else ((), (), ())
+    distinct_accounts = set(accounts)
+    account_currencies = get_account_currencies(distinct_accounts)
     target_currency = determine_display_currency(
         currency_mode,
-        [s for s, _, _ in splits_data],
+        splits,
         account_currencies,
         config.base_currency,
     )
@@ -986,28 +1015,50 @@ def _splits_to_rows(
     elif notes_map is None:
         notes_map = {}
 
+    # Resolve each distinct account's currency and display name once
+    account_info = {
+        acc: (
+            acc.commodity.mnemonic if acc.commodity else "???",
+            _account_name(acc.fullname, full_account),
+        )
+        for acc in distinct_accounts
+    }
+
+    # Look up every exchange rate the rows need in one batch
+    rates = {}
+    if target_currency:
+        needed = set()
+        for _, tx, acc in splits_data:
+            split_currency = account_info[acc][0]
+            if split_currency != target_currency:
+                needed.add((split_currency, target_currency, tx.post_date))
+        if needed:
+            converter = CurrencyConverter(
+                config.resolve_book_path(),
+                base_currency=getattr(args, "base_currency", None)
+                or config.base_currency,
+                lookback_days=getattr(args, "fx_lookback", None)
+                or config.fx_lookback_days,
+            )
+            rates = converter.rates_for(needed)
+
     for split, tx, acc in splits_data:
-        split_value = Decimal(str(split.value))
-        if not signed:
-            split_value = abs(split_value)
+        split_value = get_split_value(split)
+        if not signed and split_value.is_signed():
+            split_value = -split_value
 
-        split_currency = acc.commodity.mnemonic if acc.commodity else "???"
+        split_currency, display_account = account_info[acc]
 
-        # Currency conversion
+        # Currency conversion; rows without a rate keep their own currency
+        fx_rate = None
         if target_currency and target_currency != split_currency:
-            result = converter.convert(
-                split_value,
-                split_currency,
-                target_currency,
-                tx.post_date,
-            )
-            display_amount = result.amount
-            display_currency = result.currency
-            fx_rate = result.fx_rate if result.converted else None
+            fx_rate = rates[(split_currency, target_currency, tx.post_date)]
+        if fx_rate is not None:
+            display_amount = split_value * fx_rate
+            display_currency = target_currency
         else:
             display_amount = split_value
             display_currency = split_currency
-            fx_rate = None
 
         # Get notes from batch-fetched map
         notes = notes_map.get(tx.guid)
@@ -1015,7 +1066,7 @@ def _splits_to_rows(
         row = SplitRow(
             date=tx.post_date,
             description=tx.description,
-            account=_account_name(acc.fullname, full_account),
+            account=display_account,
             memo=split.memo,
             notes=notes,
             amount=display_amount,
@@ -1057,69 +1108,69 @@ def _splits_to_transactions(
     context_mode = getattr(args, "context", "full")
     signed = getattr(args, "signed", False)
 
-    # Group by transaction
+    # Group by transaction, listing each transaction's splits only once
     tx_map = {}
     for split, tx, acc in splits_data:
-        if tx.guid not in tx_map:
+        entry = tx_map.get(tx.guid)
+        if entry is None:
             tx_map[tx.guid] = {
                 "tx": tx,
                 "notes": notes_map.get(tx.guid),
-                "all_splits": [],  # All splits in the transaction
-                "matching_splits": set(),  # Guids of matching splits
+                # All splits in the transaction (filtered later if balanced)
+                "all_splits": list(tx.splits),
+                "matching_splits": {split.guid},  # Guids of matching splits
             }
-
-        tx_map[tx.guid]["matching_splits"].add(split.guid)
-
-        # Add all splits of the transaction (we'll filter later for balanced)
-        for s in tx.splits:
-            tx_map[tx.guid]["all_splits"].append(s)
+        else:
+            entry["matching_splits"].add(split.guid)
 
     rows = []
+    # Display name and currency per account, shared across transactions
+    account_info = {}
     for guid, data in tx_map.items():
         tx = data["tx"]
 
-        # Dedupe all_splits by guid
-        seen_guids = set()
-        unique_all_splits = []
-        for s in data["all_splits"]:
-            if s.guid not in seen_guids:
-                seen_guids.add(s.guid)
-                unique_all_splits.append(s)
-
         if context_mode == "balanced":
             # Implement balanced context per SPEC §15.2
             selected_splits = _select_balanced_splits(
-                unique_all_splits,
+                data["all_splits"],
                 data["matching_splits"],
                 signed,
             )
         else:
             # Full context: include all splits
-            selected_splits = unique_all_splits
-
-        # Convert to SplitRow objects
+            selected_splits = data["all_splits"]
+
+        # Convert to SplitRow objects. Fields shared by every split of
+        # the transaction are read once.
+        post_date = tx.post_date
+        description = tx.description
+        notes = data["notes"]
+        tx_guid = tx.guid
         split_rows = []
         for s in selected_splits:
             split_acc = s.account
-            split_value = Decimal(str(s.value))
-            if not signed:
-                split_value = abs(split_value)
+            acc_info = account_info.get(split_acc)
+            if acc_info is None:
+                commodity = split_acc.commodity
+                acc_info = account_info[split_acc] = (
+                    _account_name(split_acc.fullname, full_account),
+                    commodity.mnemonic if commodity else "",
+                )
+            split_value = get_split_value(s)
+            if not signed and split_value.is_signed():
+                split_value = -split_value
 
             split_rows.append(
                 SplitRow(
-                    date=tx.post_date,
-                    description=tx.description,
-                    account=_account_name(split_acc.fullname, full_account),
+                    date=post_date,
+                    description=description,
+                    account=acc_info[0],
                     memo=s.memo,
-                    notes=data["notes"],
+                    notes=notes,
                     amount=split_value,
-                    currency=(
-                        split_acc.commodity.mnemonic
-                        if split_acc.commodity
-                        else ""
-                    ),
+                    currency=acc_info[1],
                     fx_rate=None,
-                    tx_guid=tx.guid,
+                    tx_guid=tx_guid,
                     split_guid=s.guid,
                 )
             )
@@ -1127,9 +1178,9 @@ def _splits_to_transactions(
         rows.append(
             TransactionRow(
                 tx_guid=guid,
-                date=tx.post_date,
-                description=tx.description,
-                notes=data["notes"],
+                date=post_date,
+                description=description,
+                notes=notes,
                 splits=split_rows,
             )
         )
@@ -1150,11 +1201,14 @@ def _select_balanced_splits(
     - Add minimal counter-splits to balance per commodity
     - Sort remaining by absolute value descending, then guid for tie-break
     """
+    # Each value is needed for sorting, balancing and the subset search;
+    # convert it once
+    value_of = {s.guid: get_split_value(s) for s in all_splits}
 
     def _find_balancing_subset(
         splits: list, target: Decimal
     ) -> Optional[list]:
-        values = [Decimal(str(s.value)) for s in splits]
+        values = [value_of[s.guid] for s in splits]
         split_count = len(splits)
 
         for size in range(1, split_count + 1):
@@ -1179,16 +1233,19 @@ def _select_balanced_splits(
 
         return None
 
-    selected = [s for s in all_splits if s.guid in matching_guids]
-    remaining = [s for s in all_splits if s.guid not in matching_guids]
-    remaining.sort(key=lambda s: (-abs(Decimal(str(s.value))), s.guid))
+    # Partition in one pass so each split is tested against the matches once
+    selected = []
+    remaining = []
+    for s in all_splits:
+        (selected if s.guid in matching_guids else remaining).append(s)
+    remaining.sort(key=lambda s: (-abs(value_of[s.guid]), s.guid))
 
     balance_by_currency: dict[str, Decimal] = {}
     remaining_by_currency: dict[str, list] = {}
 
     for s in selected:
         currency = s.account.commodity.mnemonic if s.account.commodity else ""
-        value = Decimal(str(s.value))
+        value = value_of[s.guid]
         balance_by_currency[currency] = (
             balance_by_currency.get(currency, Decimal("0")) + value
         )
@@ -1216,6 +1273,37 @@ def _select_balanced_splits(
     return selected
 
 
+def _page_end(offset: Optional[int], limit: Optional[int]) -> Optional[int]:
+    """
+    Return how many rows of the sorted order --offset and --limit reach.
+
+    None means every row is needed: there is no limit, or a negative
+    value counts back from the end of the full sorted list.
+    """
+    start = offset or 0
+    if limit and limit > 0 and start >= 0:
+        return start + limit
+    return None
+
+
+def _paginate(rows: list, offset: Optional[int], limit: Optional[int]) -> list:
+    """
+    Apply --offset and --limit to rows.
+
+    Non-negative values take a single window slice. Negative values count
+    from the end, so they keep the offset-then-limit two-step slice.
+    """
+    start = offset or 0
+    if limit:
+        if start >= 0 and limit > 0:
+            return rows[start : start + limit]
+        return rows[start:][:limit]
+    if start:
+        return rows[start:]
+    return rows
+
+
+@lru_cache(maxsize=4096)
 def _account_name(fullname: str, full_account: bool) -> str:
     """Return account name - full path or just final component."""
     if full_account:
@@ -1223,20 +1311,55 @@ def _account_name(fullname: str, full_account: bool) -> str:
     return fullname.rsplit(":", 1)[-1]
 
 
+# Sort key per --sort value; unknown keys fall back to date
+_SORT_ROW_KEYS = {
+    "date": attrgetter("date"),
+    "amount": attrgetter("amount"),
+    "account": attrgetter("account"),
+    "description": attrgetter("description"),
+}
+
+
 def _sort_rows(
-    rows: list[SplitRow], sort_key: str, reverse: bool
+    rows: list[SplitRow],
+    sort_key: str,
+    reverse: bool,
+    count: Optional[int] = None,
 ) -> list[SplitRow]:
-    """Sort split rows by the specified key."""
-    key_map = {
-        "date": lambda r: r.date,
-        "amount": lambda r: r.amount,
-        "account": lambda r: r.account,
-        "description": lambda r: r.description,
-    }
-    key_fn = key_map.get(sort_key, key_map["date"])
+    """
+    Sort split rows by the specified key.
+
+    If count is given, only the first count rows of the sorted order
+    are returned, selected with a heap instead of a full sort.
+    """
+    key_fn = _SORT_ROW_KEYS.get(sort_key, _SORT_ROW_KEYS["date"])
+    if count is not None and count < len(rows):
+        select = heapq.nlargest if reverse else heapq.nsmallest
+        return select(count, rows, key=key_fn)
     return sorted(rows, key=key_fn, reverse=reverse)
 
 
+# Handler for each subcommand, looked up by name in _dispatch
+_COMMAND_HANDLERS = {
+    "accounts": cmd_accounts,
+    "grep": cmd_grep,
+    "ledger": cmd_ledger,
+    "tx": cmd_tx,
+    "split": cmd_split,
+    "doctor": cmd_doctor,
+    "cache": cmd_cache,
+}
+
+
+def _dispatch(args, config: Config) -> int:
+    """Run the handler for an already-parsed command."""
+    handler = _COMMAND_HANDLERS.get(args.command)
+    if handler is None:
+        print(f"Unknown command: {args.command}", file=sys.stderr)
+        return 2
+    return handler(args, config)
+
+
 def main(argv: Optional[list[str]] = None) -> int:
     """Main entry point."""
     parser = create_parser()
@@ -1255,27 +1378,10 @@ def main(argv: Optional[list[str]] = None) -> int:
 
         return run_repl(config)
 
-    # Handle commands
-    if args.command == "accounts":
-        return cmd_accounts(args, config)
-    elif args.command == "grep":
-        return cmd_grep(args, config)
-    elif args.command == "ledger":
-        return cmd_ledger(args, config)
-    elif args.command == "tx":
-        return cmd_tx(args, config)
-    elif args.command == "split":
-        return cmd_split(args, config)
-    elif args.command == "doctor":
-        return cmd_doctor(args, config)
-    elif args.command == "cache":
-        return cmd_cache(args, config)
-    elif args.command is None:
+    if args.command is None:
         parser.print_help()
         return 0
-    else:
-        print(f"Unknown command: {args.command}", file=sys.stderr)
-        return 2
+    return _dispatch(args, config)
 
 
 if __name__ == "__main__":
@@ -11,6 +11,7 @@ Handles loading configuration from multiple sources with precedence:
 import os
 import sys
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -93,19 +94,34 @@ class Config:
         return None
 
 
+@lru_cache(maxsize=1)
+def _load_toml_cached(path: str, mtime: float) -> dict:
+    """
+    Parse a TOML file, memoized on (path, mtime).
+
+    The mtime is part of the cache key so that edits to the file are
+    picked up on the next call without explicit invalidation.
+    """
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
 def load_config_file() -> dict:
     """
     Load configuration from XDG config file.
 
-    Returns an empty dict if the file doesn't exist.
+    Returns an empty dict if the file doesn't exist. The parsed result
+    is cached until the file's mtime changes, so callers must treat the
+    returned dict as read-only.
     """
     config_file = get_xdg_config_home() / "gcg" / "config.toml"
-    if not config_file.exists():
+    try:
+        mtime = config_file.stat().st_mtime
+    except OSError:
         return {}
 
     try:
-        with open(config_file, "rb") as f:
-            return tomllib.load(f)
+        return _load_toml_cached(str(config_file), mtime)
     except (OSError, tomllib.TOMLDecodeError) as e:
         # Log warning but don't fail
         print(
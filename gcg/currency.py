@@ -10,7 +10,7 @@ from dataclasses import dataclass
 from datetime import date, timedelta
 from decimal import Decimal
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
 
 @dataclass
@@ -60,6 +60,7 @@ class CurrencyConverter:
         from_currency: str,
         to_currency: str,
         on_date: date,
+        conn: Optional[sqlite3.Connection] = None,
     ) -> Optional[Decimal]:
         """
         Get exchange rate from the price database.
@@ -71,6 +72,7 @@ class CurrencyConverter:
             from_currency: Source currency mnemonic
             to_currency: Target currency mnemonic
             on_date: Date to find price for
+            conn: Open connection to query; one is opened if omitted
 
         Returns:
             Exchange rate as Decimal, or None if not found
@@ -93,26 +95,66 @@ class CurrencyConverter:
                 return rate
 
         # Query database
-        rate = self._lookup_price(from_currency, to_currency, on_date)
+        rate = self._lookup_price(from_currency, to_currency, on_date, conn)
         self._price_cache[cache_key] = rate
         return rate
 
+    def rates_for(
+        self,
+        keys: Iterable[tuple[str, str, date]],
+    ) -> dict[tuple[str, str, date], Optional[Decimal]]:
+        """
+        Get exchange rates for many (from, to, date) keys at once.
+
+        Rates not already cached are looked up over a single database
+        connection instead of one connection per lookup.
+
+        Args:
+            keys: (from_currency, to_currency, on_date) tuples
+
+        Returns:
+            Dict mapping each key to its rate, or None if not found
+        """
+        rates: dict[tuple[str, str, date], Optional[Decimal]] = {}
+        conn = None
+        try:
+            for key in keys:
+                if key in rates:
+                    continue
+                if conn is None and key not in self._price_cache:
+                    try:
+                        conn = sqlite3.connect(
+                            f"file:{self.db_path}?mode=ro", uri=True
+                        )
+                    except sqlite3.Error:
+                        pass
+                rates[key] = self.get_price(*key, conn=conn)
+        finally:
+            if conn is not None:
+                conn.close()
+        return rates
+
     def _lookup_price(
         self,
         from_currency: str,
         to_currency: str,
         on_date: date,
+        conn: Optional[sqlite3.Connection] = None,
     ) -> Optional[Decimal]:
         """
         Look up price in the database.
 
-        Tries both direct and inverse lookups.
+        Tries both direct and inverse lookups. Uses conn if given,
+        otherwise opens (and closes) a connection of its own.
         """
-        uri = f"file:{self.db_path}?mode=ro"
         earliest_date = on_date - timedelta(days=self.lookback_days)
+        own_conn = conn is None
 
         try:
-            conn = sqlite3.connect(uri, uri=True)
+            if own_conn:
+                conn = sqlite3.connect(
+                    f"file:{self.db_path}?mode=ro", uri=True
+                )
             cursor = conn.cursor()
 
             # Try direct lookup: from_currency -> to_currency
@@ -141,9 +183,7 @@ class CurrencyConverter:
 
             if result:
                 num, denom = result
-                rate = Decimal(num) / Decimal(denom)
-                conn.close()
-                return rate
+                return Decimal(num) / Decimal(denom)
 
             # Try inverse lookup: to_currency -> from_currency
             cursor.execute(
@@ -168,8 +208,6 @@ class CurrencyConverter:
             )
             result = cursor.fetchone()
 
-            conn.close()
-
             if result:
                 num, denom = result
                 inverse_rate = Decimal(num) / Decimal(denom)
@@ -179,6 +217,9 @@ class CurrencyConverter:
 
         except sqlite3.Error:
             return None
+        finally:
+            if own_conn and conn is not None:
+                conn.close()
 
     def convert(
         self,
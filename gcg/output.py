@@ -5,14 +5,16 @@ Supports table, CSV, and JSON output formats with configurable columns.
 """
 
 import csv
+import io
 import json
+import re
 import sys
 from dataclasses import dataclass
 from datetime import date
 from decimal import Decimal
-from typing import Any, Optional
-
-from tabulate import tabulate
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+from typing import Any, Collection, Optional, Sequence
 
 # Default columns for split output
 DEFAULT_SPLIT_COLUMNS = [
@@ -33,8 +35,51 @@ DEFAULT_ACCOUNT_COLUMNS = [
     "currency",
 ]
 
+# Buffered output is handed to the real file in chunks of about this size
+OUTPUT_CHUNK_SIZE = 64 * 1024
+
+# CSV and JSON rows are rendered and written in batches of this many rows
+OUTPUT_CHUNK_ROWS = 1000
+
+# Characters (besides the delimiter) that force csv.writer to quote a field
+_CSV_NEEDS_QUOTING = re.compile(r'["\r\n]').search
+
+# Dates repeat heavily across a ledger, so memoize their ISO rendering
+_iso_date = lru_cache(maxsize=4096)(date.isoformat)
+
+# Row classes are created in bulk, so drop the per-instance __dict__
+# where dataclasses supports it (Python 3.10+)
+_ROW_DATACLASS_OPTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _json_default(obj: Any) -> str:
+    """Encode the non-JSON types that can appear in output rows."""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, date):
+        return obj.isoformat()
+    raise TypeError(
+        f"Object of type {type(obj).__name__} is not JSON serializable"
+    )
+
+
+# Shared encoder for streamed JSON output (matches json.dump indent=2).
+# orjson, when installed, produces identical text several times faster.
+try:
+    import orjson
+
+    def _encode_json(obj: Any) -> str:
+        return orjson.dumps(
+            obj, default=_json_default, option=orjson.OPT_INDENT_2
+        ).decode()
+
+except ImportError:
+    _encode_json = json.JSONEncoder(
+        indent=2, ensure_ascii=False, default=_json_default
+    ).encode
 
-@dataclass
+
+@dataclass(**_ROW_DATACLASS_OPTS)
 class SplitRow:
     """Represents a split row for output."""
 
@@ -54,8 +99,10 @@ class SplitRow:
 
     def to_dict(self, include_notes: bool = True) -> dict[str, Any]:
         """Convert to dictionary for JSON/CSV output."""
+        fx_rate = self.fx_rate
+        amount_orig = self.amount_orig
         result = {
-            "date": self.date.isoformat(),
+            "date": _iso_date(self.date),
             "description": self.description,
             "account": self.account,
             "memo": self.memo or "",
@@ -65,25 +112,26 @@ class SplitRow:
             "split_guid": self.split_guid,
         }
 
-        if include_notes and self.notes:
-            result["notes"] = self.notes
+        # Optional keys are added in a fixed order so JSON key order
+        # stays stable: notes, fx_rate, account_guid, original amount.
+        if include_notes:
+            notes = self.notes
+            if notes:
+                result["notes"] = notes
 
-        if self.fx_rate is not None:
-            result["fx_rate"] = str(self.fx_rate)
-        else:
-            result["fx_rate"] = None
+        result["fx_rate"] = None if fx_rate is None else str(fx_rate)
 
         if self.account_guid:
             result["account_guid"] = self.account_guid
 
-        if self.amount_orig is not None:
-            result["amount_orig"] = str(self.amount_orig)
+        if amount_orig is not None:
+            result["amount_orig"] = str(amount_orig)
             result["currency_orig"] = self.currency_orig
 
         return result
 
 
-@dataclass
+@dataclass(**_ROW_DATACLASS_OPTS)
 class TransactionRow:
     """Represents a transaction with its splits for full-tx output."""
 
@@ -97,7 +145,7 @@ class TransactionRow:
         """Convert to dictionary for JSON output."""
         result = {
             "tx_guid": self.tx_guid,
-            "date": self.date.isoformat(),
+            "date": _iso_date(self.date),
             "description": self.description,
             "splits": [s.to_dict(include_notes) for s in self.splits],
         }
@@ -106,7 +154,7 @@ class TransactionRow:
         return result
 
 
-@dataclass
+@dataclass(**_ROW_DATACLASS_OPTS)
 class AccountRow:
     """Represents an account row for output."""
 
@@ -138,6 +186,7 @@ class OutputFormatter:
         fields: Optional[list[str]] = None,
         include_notes: bool = True,
         show_guids: bool = False,
+        include_original: bool = True,
     ):
         """
         Initialize formatter.
@@ -148,12 +197,16 @@ class OutputFormatter:
             fields: Custom field list (None for defaults)
             include_notes: Include notes field if available
             show_guids: Include GUID fields in account output
+            include_original: Rows may carry original amounts; pass
+                False when the producer knows none do, so split output
+                skips looking for them
         """
         self.format_type = format_type
         self.show_header = show_header
         self.fields = fields
         self.include_notes = include_notes
         self.show_guids = show_guids
+        self.include_original = include_original
 
     def format_splits(
         self,
@@ -173,12 +226,13 @@ class OutputFormatter:
         if not rows:
             return
 
-        if self.format_type == "json":
-            self._format_splits_json(rows, file)
-        elif self.format_type == "csv":
-            self._format_splits_csv(rows, file)
-        else:
-            self._format_splits_table(rows, file)
+        with _ChunkedWriter(file) as out:
+            if self.format_type == "json":
+                self._format_splits_json(rows, out)
+            elif self.format_type == "csv":
+                self._format_splits_csv(rows, out)
+            else:
+                self._format_splits_table(rows, out)
 
     def format_transactions(
         self,
@@ -198,17 +252,18 @@ class OutputFormatter:
         if not rows:
             return
 
-        if self.format_type == "json":
-            self._format_transactions_json(rows, file)
-        elif self.format_type == "csv":
-            # CSV flattens to splits with tx info
-            all_splits = []
-            for tx in rows:
-                for split in tx.splits:
-                    all_splits.append(split)
-            self._format_splits_csv(all_splits, file)
-        else:
-            self._format_transactions_table(rows, file)
+        with _ChunkedWriter(file) as out:
+            if self.format_type == "json":
+                self._format_transactions_json(rows, out)
+            elif self.format_type == "csv":
+                # CSV flattens to splits with tx info
+                all_splits = []
+                for tx in rows:
+                    for split in tx.splits:
+                        all_splits.append(split)
+                self._format_splits_csv(all_splits, out)
+            else:
+                self._format_transactions_table(rows, out)
 
     def format_accounts(
         self,
@@ -230,59 +285,83 @@ class OutputFormatter:
         if not rows:
             return
 
-        if self.format_type == "json":
-            self._format_accounts_json(rows, file)
-        elif self.format_type == "csv":
-            self._format_accounts_csv(rows, file)
-        else:
-            self._format_accounts_table(rows, tree_mode, file)
+        with _ChunkedWriter(file) as out:
+            if self.format_type == "json":
+                self._format_accounts_json(rows, out)
+            elif self.format_type == "csv":
+                self._format_accounts_csv(rows, out)
+            else:
+                self._format_accounts_table(rows, tree_mode, out)
 
     def _format_splits_table(self, rows: list[SplitRow], file) -> None:
         """Format splits as a table."""
-        headers = ["Date", "Description", "Account", "Memo", "Amount", "Ccy"]
-
-        # Check if we need notes column
-        has_notes = self.include_notes and any(r.notes for r in rows)
-        if has_notes:
-            headers.insert(4, "Notes")
-
-        # Check if we have original amounts
-        has_orig = any(r.amount_orig is not None for r in rows)
-        if has_orig:
-            headers.extend(["Orig Amt", "Orig Ccy"])
+        headers = [
+            "Date",
+            "Description",
+            "Account",
+            "Memo",
+            "Notes",
+            "Amount",
+            "Ccy",
+            "Orig Amt",
+            "Orig Ccy",
+        ]
 
+        # Build every optional cell in the same pass that discovers
+        # whether any row needs it; unused columns are hidden at render.
+        include_notes = self.include_notes
+        include_original = self.include_original
+        has_notes = False
+        has_orig = False
         table_data = []
         for row in rows:
-            line = [
-                str(row.date),
-                _truncate(row.description, 40),
-                _truncate(row.account, 35),
-                _truncate(row.memo or "", 25),
-                _format_amount(row.amount),
-                row.currency,
-            ]
-            if has_notes:
-                line.insert(4, _truncate(row.notes or "", 25))
-            if has_orig:
-                line.extend(
-                    [
-                        (
-                            _format_amount(row.amount_orig)
-                            if row.amount_orig
-                            else ""
-                        ),
-                        row.currency_orig or "",
-                    ]
+            # _truncate() inlined: this loop runs once per output row and
+            # most values are already short enough.
+            description = row.description
+            if len(description) > 40:
+                description = description[:37] + "..."
+            account = row.account
+            if len(account) > 35:
+                account = account[:32] + "..."
+            memo = row.memo or ""
+            if len(memo) > 25:
+                memo = memo[:22] + "..."
+            notes = (row.notes or "") if include_notes else ""
+            if notes:
+                has_notes = True
+                if len(notes) > 25:
+                    notes = notes[:22] + "..."
+            amount_orig = row.amount_orig if include_original else None
+            if amount_orig is not None:
+                has_orig = True
+            table_data.append(
+                (
+                    _iso_date(row.date),
+                    description,
+                    account,
+                    memo,
+                    notes,
+                    _format_amount(row.amount),
+                    row.currency,
+                    _format_amount(amount_orig) if amount_orig else "",
+                    row.currency_orig or "",
                 )
-            table_data.append(line)
-
-        if self.show_header:
-            print(
-                tabulate(table_data, headers=headers, tablefmt="simple"),
-                file=file,
             )
-        else:
-            print(tabulate(table_data, tablefmt="plain"), file=file)
+
+        hidden = set()
+        if not has_notes:
+            hidden.add(4)
+        if not has_orig:
+            hidden.update((7, 8))
+
+        _write_table(
+            file,
+            headers,
+            table_data,
+            self.show_header,
+            right_aligned=("Amount", "Orig Amt"),
+            hidden=hidden,
+        )
 
     def _format_splits_csv(self, rows: list[SplitRow], file) -> None:
         """Format splits as CSV."""
@@ -302,61 +381,103 @@ class OutputFormatter:
             "split_guid",
         ]
 
-        has_notes = self.include_notes and any(r.notes for r in rows)
+        # Single scan for optional columns, skipped for columns the
+        # producer ruled out and stopped once the rest are seen
+        include_notes = self.include_notes
+        include_original = self.include_original
+        has_notes = False
+        has_orig = False
+        if include_notes or include_original:
+            for row in rows:
+                if include_notes and not has_notes and row.notes:
+                    has_notes = True
+                if (
+                    include_original
+                    and not has_orig
+                    and row.amount_orig is not None
+                ):
+                    has_orig = True
+                if (has_notes or not include_notes) and (
+                    has_orig or not include_original
+                ):
+                    break
+
         if has_notes:
             fieldnames.insert(4, "notes")
-
-        has_orig = any(r.amount_orig is not None for r in rows)
         if has_orig:
             fieldnames.extend(["amount_orig", "currency_orig"])
 
-        writer = csv.DictWriter(
-            file, fieldnames=fieldnames, extrasaction="ignore"
-        )
+        # Column names match SplitRow attributes, so a single attrgetter
+        # yields each row as a tuple; csv.writer renders None as "" and
+        # str()s dates and Decimals the same way to_dict() does.
+        row_values = attrgetter(*fieldnames)
+
+        # Rows are rendered into a list of lines that is written out every
+        # OUTPUT_CHUNK_ROWS rows; csv.writer appends to the same list.
+        lines = _LineBuffer()
+        writer = csv.writer(lines)
         if self.show_header:
-            writer.writeheader()
+            writer.writerow(fieldnames)
+
+        # Fast path: most ledger text needs no quoting, so join the row
+        # directly and only hand it to csv.writer when a field contains a
+        # delimiter (detected as extra commas), quote or line break.
+        append = lines.append
+        needs_quoting = _CSV_NEEDS_QUOTING
+        terminator = writer.dialect.lineterminator
+        separators = len(fieldnames) - 1
+        for values in map(row_values, rows):
+            line = ",".join(["" if v is None else str(v) for v in values])
+            if line.count(",") == separators and not needs_quoting(line):
+                append(line + terminator)
+            else:
+                writer.writerow(values)
+            if len(lines) >= OUTPUT_CHUNK_ROWS:
+                file.write("".join(lines))
+                lines.clear()
 
-        for row in rows:
-            writer.writerow(row.to_dict(self.include_notes))
+        file.write("".join(lines))
 
     def _format_splits_json(self, rows: list[SplitRow], file) -> None:
         """Format splits as JSON array."""
-        data = [row.to_dict(self.include_notes) for row in rows]
-        json.dump(data, file, indent=2, ensure_ascii=False)
-        print(file=file)
+        include_notes = self.include_notes
+        _write_json_array((row.to_dict(include_notes) for row in rows), file)
 
     def _format_transactions_table(
         self, rows: list[TransactionRow], file
     ) -> None:
         """Format transactions with their splits as table blocks."""
         for i, tx in enumerate(rows):
+            # Each block is assembled as one string and written once,
+            # instead of a print() per line.
+            lines = []
             if i > 0:
-                print(file=file)  # Blank line between transactions
+                lines.append("\n")  # Blank line between transactions
 
             # Transaction header
-            print(f"[{tx.date}] {tx.description}", file=file)
+            lines.append(f"[{_iso_date(tx.date)}] {tx.description}\n")
             if tx.notes:
-                print(f"  Notes: {tx.notes}", file=file)
-            print(f"  GUID: {tx.tx_guid}", file=file)
+                lines.append(f"  Notes: {tx.notes}\n")
+            lines.append(f"  GUID: {tx.tx_guid}\n")
 
             # Splits
             for split in tx.splits:
                 amount_str = _format_amount(split.amount)
-                print(
+                lines.append(
                     f"    {split.account:<40} {amount_str:>12} "
-                    f"{split.currency}",
-                    file=file,
+                    f"{split.currency}\n"
                 )
                 if split.memo:
-                    print(f"      Memo: {split.memo}", file=file)
+                    lines.append(f"      Memo: {split.memo}\n")
+
+            file.write("".join(lines))
 
     def _format_transactions_json(
         self, rows: list[TransactionRow], file
     ) -> None:
         """Format transactions as JSON array."""
-        data = [row.to_dict(self.include_notes) for row in rows]
-        json.dump(data, file, indent=2, ensure_ascii=False)
-        print(file=file)
+        include_notes = self.include_notes
+        _write_json_array((row.to_dict(include_notes) for row in rows), file)
 
     def _format_accounts_table(
         self, rows: list[AccountRow], tree_mode: bool, file
@@ -380,13 +501,7 @@ class OutputFormatter:
                 line.append(row.guid or "")
             table_data.append(line)
 
-        if self.show_header:
-            print(
-                tabulate(table_data, headers=headers, tablefmt="simple"),
-                file=file,
-            )
-        else:
-            print(tabulate(table_data, tablefmt="plain"), file=file)
+        _write_table(file, headers, table_data, self.show_header)
 
     def _format_accounts_csv(self, rows: list[AccountRow], file) -> None:
         """Format accounts as CSV."""
@@ -394,18 +509,127 @@ class OutputFormatter:
         if self.show_guids:
             fieldnames.append("guid")
 
-        writer = csv.DictWriter(file, fieldnames=fieldnames)
+        writer = csv.writer(file)
         if self.show_header:
-            writer.writeheader()
+            writer.writerow(fieldnames)
 
-        for row in rows:
-            writer.writerow(row.to_dict(self.show_guids))
+        # Field names match AccountRow attributes; let the C writerows
+        # loop pull tuples straight from the rows.
+        writer.writerows(map(attrgetter(*fieldnames), rows))
 
     def _format_accounts_json(self, rows: list[AccountRow], file) -> None:
         """Format accounts as JSON array."""
-        data = [row.to_dict(self.show_guids) for row in rows]
-        json.dump(data, file, indent=2, ensure_ascii=False)
-        print(file=file)
+        show_guids = self.show_guids
+        _write_json_array((row.to_dict(show_guids) for row in rows), file)
+
+
+class _LineBuffer(list):
+    """List of text fragments usable as a csv.writer target."""
+
+    write = list.append
+
+
+class _ChunkedWriter:
+    """
+    File-like wrapper that collects writes in memory.
+
+    Text is passed on to the underlying file in chunks of roughly
+    OUTPUT_CHUNK_SIZE characters, so formatters can write line by line
+    without paying for a write call (or a line-buffered flush) per line.
+    """
+
+    def __init__(self, file, chunk_size: int = OUTPUT_CHUNK_SIZE):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._buf = io.StringIO()
+
+    def write(self, text: str) -> int:
+        """Buffer text, handing it on once the chunk size is reached."""
+        written = self._buf.write(text)
+        if self._buf.tell() >= self._chunk_size:
+            self.flush()
+        return written
+
+    def flush(self) -> None:
+        """Write any buffered text to the underlying file."""
+        data = self._buf.getvalue()
+        if data:
+            self._file.write(data)
+            self._buf.seek(0)
+            self._buf.truncate()
+
+    def __enter__(self) -> "_ChunkedWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.flush()
+
+
+def _write_table(
+    file,
+    headers: list[str],
+    table_data: list[Sequence[str]],
+    show_header: bool,
+    right_aligned: tuple[str, ...] = (),
+    hidden: Collection[int] = (),
+) -> None:
+    """
+    Write rows of string cells as a plain aligned text table.
+
+    Columns are separated by two spaces and sized to their widest cell
+    (including the header when shown); a row of dashes follows the
+    header. Columns named in right_aligned are right-justified, and
+    column indexes in hidden are left out of the output.
+    """
+    shown = [i for i in range(len(headers)) if i not in hidden]
+    # Measure one column at a time straight from the rows rather
+    # than transposing the whole table (hidden columns are never read).
+    widths = [
+        max(
+            len(headers[i]) if show_header else 0,
+            max(map(len, map(itemgetter(i), table_data)), default=0),
+        )
+        for i in shown
+    ]
+    fmt = "  ".join(
+        f"{{{i}:{'>' if headers[i] in right_aligned else '<'}{width}}}"
+        for i, width in zip(shown, widths)
+    )
+
+    lines = []
+    if show_header:
+        lines.append(fmt.format(*headers).rstrip())
+        lines.append("  ".join("-" * width for width in widths))
+    lines.extend(fmt.format(*line).rstrip() for line in table_data)
+    file.write("\n".join(lines) + "\n")
+
+
+def _write_json_array(items, file) -> None:
+    """
+    Stream an iterable of JSON-serializable objects as a JSON array.
+
+    Elements are encoded one at a time and written in batches of
+    OUTPUT_CHUNK_ROWS, so the full list of dicts is never held in memory.
+    The output is byte-for-byte what json.dump(list(items), file,
+    indent=2, ensure_ascii=False) produces, followed by a newline.
+    """
+    parts = []
+    separator = "[\n  "
+    for obj in items:
+        parts.append(separator)
+        # Encoded JSON never contains raw newlines inside strings, so
+        # re-indenting by one level is a plain replace.
+        parts.append(_encode_json(obj).replace("\n", "\n  "))
+        separator = ",\n  "
+        if len(parts) >= 2 * OUTPUT_CHUNK_ROWS:
+            file.write("".join(parts))
+            parts.clear()
+
+    if separator == "[\n  ":
+        parts.append("[]\n")
+    else:
+        parts.append("\n]\n")
+    file.write("".join(parts))
 
 
 def _truncate(text: str, max_len: int) -> str:
@@ -419,5 +643,19 @@ def _format_amount(amount: Optional[Decimal]) -> str:
     """Format a decimal amount for display."""
     if amount is None:
         return ""
-    # Format with 2 decimal places, right-aligned
+    if not amount:
+        # Common for zero-value splits; also avoids rendering "-0.00"
+        return "0.00"
+    return _format_nonzero_amount(amount)
+
+
+@lru_cache(maxsize=4096)
+def _format_nonzero_amount(amount: Decimal) -> str:
+    """
+    Format with 2 decimal places and thousands separators.
+
+    Memoized because the same amounts (rent, salary, subscriptions)
+    recur throughout a ledger. Equal Decimals hash alike and round to
+    the same text, so "5.0" and "5.00" safely share an entry.
+    """
     return f"{amount:,.2f}"
@@ -5,23 +5,28 @@ Provides a readline-enabled interactive shell for querying
 GnuCash books without repeatedly loading them.
 """
 
+import argparse
 import re
 import readline
 import shlex
+import sqlite3
 import sys
 from datetime import date
 from decimal import Decimal
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 from gcg.book import (
     BookOpenError,
     InvalidPatternError,
+    connect_readonly,
     get_account_by_pattern,
-    get_transaction_notes,
+    get_split_value,
     get_transaction_notes_batch,
     open_gnucash_book,
 )
+from gcg.cli import _page_end, _paginate, _sort_rows
 from gcg.config import Config, get_xdg_state_home
 from gcg.currency import (
     CurrencyConverter,
@@ -36,6 +41,7 @@ from gcg.output import (
 )
 
 
+@lru_cache(maxsize=4096)
 def _account_name(fullname: str, full_account: bool) -> str:
     """Return account name - full path or just final component."""
     if full_account:
@@ -43,6 +49,100 @@ def _account_name(fullname: str, full_account: bool) -> str:
     return fullname.rsplit(":", 1)[-1]
 
 
+def _accounts_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the REPL 'accounts' command."""
+    parser = argparse.ArgumentParser(prog="accounts")
+    parser.add_argument("pattern", nargs="?", default="")
+    parser.add_argument("--regex", action="store_true")
+    parser.add_argument("--case-sensitive", action="store_true")
+    parser.add_argument("--tree", action="store_true")
+    parser.add_argument("--tree-prune", action="store_true")
+    parser.add_argument("--max-depth", type=int)
+    parser.add_argument("--show-guids", action="store_true")
+    parser.add_argument("--no-header", action="store_true")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--offset", type=int)
+    return parser
+
+
+def _grep_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the REPL 'grep' command."""
+    parser = argparse.ArgumentParser(prog="grep")
+    parser.add_argument("text")
+    parser.add_argument("--regex", action="store_true")
+    parser.add_argument("--case-sensitive", action="store_true")
+    parser.add_argument(
+        "--in", dest="search_fields", default="desc,memo,notes"
+    )
+    parser.add_argument("--account", metavar="PATTERN")
+    parser.add_argument("--account-regex", action="store_true")
+    parser.add_argument("--no-subtree", action="store_true")
+    parser.add_argument("--after", type=str)
+    parser.add_argument("--before", type=str)
+    parser.add_argument("--amount", type=str)
+    parser.add_argument("--signed", action="store_true")
+    parser.add_argument("--full-tx", action="store_true")
+    parser.add_argument("--no-header", action="store_true")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--offset", type=int)
+    parser.add_argument("--sort", default="date")
+    parser.add_argument("--reverse", action="store_true")
+    return parser
+
+
+def _ledger_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the REPL 'ledger' command."""
+    parser = argparse.ArgumentParser(prog="ledger")
+    parser.add_argument("account_pattern")
+    parser.add_argument("--account-regex", action="store_true")
+    parser.add_argument("--no-subtree", action="store_true")
+    parser.add_argument("--after", type=str)
+    parser.add_argument("--before", type=str)
+    parser.add_argument("--amount", type=str)
+    parser.add_argument("--signed", action="store_true")
+    parser.add_argument("--no-header", action="store_true")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--offset", type=int)
+    parser.add_argument("--sort", default="date")
+    parser.add_argument("--reverse", action="store_true")
+    return parser
+
+
+# Prompts shown with and without an open book
+_PROMPT_BOOK = "gcg> "
+_PROMPT_NO_BOOK = "gcg (no book)> "
+
+# Commands that can only run once a book is open
+_BOOK_COMMANDS = frozenset(("accounts", "grep", "ledger", "tx", "split"))
+
+# REPL command parsers are built once and reused for every command
+_ACCOUNTS_PARSER = _accounts_parser()
+_GREP_PARSER = _grep_parser()
+_LEDGER_PARSER = _ledger_parser()
+
+
+class _Completer:
+    """
+    readline completer for command names.
+
+    readline calls the completer with state 0, 1, 2, ... for the same
+    text until it returns None, so matches are computed once per text.
+    """
+
+    def __init__(self, commands):
+        self._commands = tuple(sorted(commands))
+        self._text: Optional[str] = None
+        self._matches: list[str] = []
+
+    def __call__(self, text: str, state: int) -> Optional[str]:
+        if text != self._text:
+            self._text = text
+            self._matches = [c for c in self._commands if c.startswith(text)]
+        if state < len(self._matches):
+            return self._matches[state]
+        return None
+
+
 class ReplSession:
     """
     Interactive REPL session for gcg.
@@ -65,6 +165,38 @@ class ReplSession:
         self.book_path = None
         self.running = True
 
+        # Command name -> handler, used for dispatch and tab completion
+        self._commands = {
+            "open": self.cmd_open,
+            "accounts": self.cmd_accounts,
+            "grep": self.cmd_grep,
+            "ledger": self.cmd_ledger,
+            "tx": self.cmd_tx,
+            "split": self.cmd_split,
+            "set": self.cmd_set,
+            "help": self.cmd_help,
+            "quit": self.cmd_quit,
+            "exit": self.cmd_quit,
+        }
+
+        # Accounts of the open book, excluding ROOT and TRADING
+        self._accounts: list = []
+
+        # GUID lookup tables for tx/split, built on first use per book
+        self._tx_by_guid: Optional[dict] = None
+        self._split_by_guid: Optional[dict] = None
+
+        # Currency converter for the open book, kept so its price cache
+        # is shared between commands
+        self._converter: Optional[CurrencyConverter] = None
+
+        # Read-only connection to the open book file for notes queries
+        self._notes_conn: Optional[sqlite3.Connection] = None
+
+        # Transaction notes already read from the open book, by tx GUID
+        # (None when a transaction has no notes)
+        self._notes_cache: dict[str, Optional[str]] = {}
+
         # Session settings (can be changed with 'set' command)
         self.output_format = config.output_format
         self.currency_mode = config.currency_mode
@@ -75,6 +207,8 @@ class ReplSession:
         self.history_path = config.history_path or (
             get_xdg_state_home() / "gcg" / "history"
         )
+        # History entries already in the history file
+        self._history_saved = 0
 
     def setup_readline(self) -> None:
         """Configure readline with history and completion."""
@@ -88,35 +222,37 @@ class ReplSession:
             except (OSError, IOError):
                 pass
 
+        self._history_saved = readline.get_current_history_length()
+
         # Set history length
         readline.set_history_length(1000)
 
         # Basic tab completion
-        commands = [
-            "open",
-            "accounts",
-            "grep",
-            "ledger",
-            "tx",
-            "split",
-            "set",
-            "help",
-            "quit",
-            "exit",
-        ]
-        readline.set_completer(
-            lambda text, state: (
-                [c for c in commands if c.startswith(text)] + [None]
-            )[state]
-        )
+        readline.set_completer(_Completer(self._commands))
         readline.parse_and_bind("tab: complete")
 
     def save_history(self) -> None:
-        """Save command history to file."""
+        """
+        Save new command history to file.
+
+        Only entries added since the last save are appended (readline
+        then trims the file to the history length), so this is cheap
+        enough to call after every command.
+        """
+        length = readline.get_current_history_length()
+        new_entries = length - self._history_saved
+        if new_entries <= 0:
+            return
         try:
-            readline.write_history_file(str(self.history_path))
+            if self.history_path.exists():
+                readline.append_history_file(
+                    new_entries, str(self.history_path)
+                )
+            else:
+                readline.write_history_file(str(self.history_path))
         except (OSError, IOError):
-            pass
+            return
+        self._history_saved = length
 
     def open_book(self, path: Optional[str] = None) -> bool:
         """
@@ -143,6 +279,11 @@ class ReplSession:
             self._book_ctx = open_gnucash_book(book_path)
             self.book, self.book_info = self._book_ctx.__enter__()
             self.book_path = book_path
+            self._accounts = [
+                a
+                for a in self.book.accounts
+                if a.type not in ("ROOT", "TRADING")
+            ]
             print(f"Opened: {book_path}")
             print(f"  Accounts: {self.book_info.account_count}")
             print(f"  Transactions: {self.book_info.transaction_count}")
@@ -164,6 +305,75 @@ class ReplSession:
         self.book_info = None
         self.book_path = None
         self._book_ctx = None
+        self._accounts = []
+        self._tx_by_guid = None
+        self._split_by_guid = None
+        self._notes_cache = {}
+        self._converter = None
+        if self._notes_conn is not None:
+            self._notes_conn.close()
+            self._notes_conn = None
+
+    def _get_converter(self) -> CurrencyConverter:
+        """Get the open book's currency converter, creating it on first use."""
+        converter = self._converter
+        if converter is None or converter.base_currency != self.base_currency:
+            converter = self._converter = CurrencyConverter(
+                self.book_path,
+                base_currency=self.base_currency,
+                lookback_days=self.config.fx_lookback_days,
+            )
+        return converter
+
+    def _get_notes(self, tx_guids) -> dict[str, str]:
+        """
+        Get notes for transactions in the open book.
+
+        Notes are fetched in one batch for GUIDs not seen before in
+        this session and cached; only transactions with notes appear
+        in the result. A failed query caches nothing and drops the
+        connection, so the next call reconnects and tries again.
+        """
+        cache = self._notes_cache
+        missing = [guid for guid in tx_guids if guid not in cache]
+        if missing:
+            if self._notes_conn is None:
+                try:
+                    self._notes_conn = connect_readonly(self.book_path)
+                except sqlite3.Error:
+                    return {}
+            try:
+                found = get_transaction_notes_batch(
+                    self.book_path,
+                    missing,
+                    self.book_info.has_notes_column,
+                    conn=self._notes_conn,
+                )
+            except sqlite3.Error:
+                self._notes_conn.close()
+                self._notes_conn = None
+                return {
+                    guid: cache[guid] for guid in tx_guids if cache.get(guid)
+                }
+            for guid in missing:
+                cache[guid] = found.get(guid)
+        return {guid: cache[guid] for guid in tx_guids if cache[guid]}
+
+    def _find_transaction(self, guid: str):
+        """Look up a transaction in the open book by GUID."""
+        if self._tx_by_guid is None:
+            self._tx_by_guid = {tx.guid: tx for tx in self.book.transactions}
+        return self._tx_by_guid.get(guid)
+
+    def _find_split(self, guid: str):
+        """Look up a split and its account in the open book by GUID."""
+        if self._split_by_guid is None:
+            self._split_by_guid = {
+                split.guid: (split, acc)
+                for acc in self.book.accounts
+                for split in acc.splits
+            }
+        return self._split_by_guid.get(guid, (None, None))
 
     def run_command(self, line: str) -> None:
         """
@@ -186,47 +396,27 @@ class ReplSession:
             return
 
         cmd = parts[0].lower()
-        args = parts[1:]
-
-        if cmd in ("quit", "exit"):
-            self.running = False
-            return
-
-        if cmd == "help":
-            self.cmd_help(args)
+        handler = self._commands.get(cmd)
+        if handler is None:
+            print(
+                f"Unknown command: {cmd}. Type 'help' for commands.",
+                file=sys.stderr,
+            )
             return
 
-        if cmd == "open":
-            if args:
-                self.open_book(args[0])
-            else:
-                self.open_book()
+        if cmd in _BOOK_COMMANDS and self.book is None:
+            print("No book open. Use 'open [path]' first.", file=sys.stderr)
             return
 
-        if cmd == "set":
-            self.cmd_set(args)
-            return
+        handler(parts[1:])
 
-        # Commands that require an open book
-        if self.book is None:
-            print("No book open. Use 'open [path]' first.", file=sys.stderr)
-            return
+    def cmd_open(self, args: list[str]) -> None:
+        """Handle the 'open' command."""
+        self.open_book(args[0] if args else None)
 
-        if cmd == "accounts":
-            self.cmd_accounts(args)
-        elif cmd == "grep":
-            self.cmd_grep(args)
-        elif cmd == "ledger":
-            self.cmd_ledger(args)
-        elif cmd == "tx":
-            self.cmd_tx(args)
-        elif cmd == "split":
-            self.cmd_split(args)
-        else:
-            print(
-                f"Unknown command: {cmd}. Type 'help' for commands.",
-                file=sys.stderr,
-            )
+    def cmd_quit(self, args: list[str]) -> None:
+        """Handle the 'quit' and 'exit' commands."""
+        self.running = False
 
     def cmd_help(self, args: list[str]) -> None:
         """Display help information."""
@@ -306,23 +496,8 @@ Options are the same as CLI. Example:
 
     def cmd_accounts(self, args: list[str]) -> None:
         """Handle the 'accounts' command in REPL using the open book."""
-        # Parse arguments
-        import argparse
-
-        parser = argparse.ArgumentParser(prog="accounts")
-        parser.add_argument("pattern", nargs="?", default="")
-        parser.add_argument("--regex", action="store_true")
-        parser.add_argument("--case-sensitive", action="store_true")
-        parser.add_argument("--tree", action="store_true")
-        parser.add_argument("--tree-prune", action="store_true")
-        parser.add_argument("--max-depth", type=int)
-        parser.add_argument("--show-guids", action="store_true")
-        parser.add_argument("--no-header", action="store_true")
-        parser.add_argument("--limit", type=int)
-        parser.add_argument("--offset", type=int)
-
         try:
-            parsed = parser.parse_args(args)
+            parsed = _ACCOUNTS_PARSER.parse_args(args)
         except SystemExit:
             return
 
@@ -362,10 +537,7 @@ Options are the same as CLI. Example:
                 )
             )
 
-        if parsed.offset:
-            rows = rows[parsed.offset :]
-        if parsed.limit:
-            rows = rows[: parsed.limit]
+        rows = _paginate(rows, parsed.offset, parsed.limit)
 
         formatter = OutputFormatter(
             format_type=self.output_format,
@@ -380,31 +552,8 @@ Options are the same as CLI. Example:
             print("Usage: grep TEXT [OPTIONS]", file=sys.stderr)
             return
 
-        import argparse
-
-        parser = argparse.ArgumentParser(prog="grep")
-        parser.add_argument("text")
-        parser.add_argument("--regex", action="store_true")
-        parser.add_argument("--case-sensitive", action="store_true")
-        parser.add_argument(
-            "--in", dest="search_fields", default="desc,memo,notes"
-        )
-        parser.add_argument("--account", metavar="PATTERN")
-        parser.add_argument("--account-regex", action="store_true")
-        parser.add_argument("--no-subtree", action="store_true")
-        parser.add_argument("--after", type=str)
-        parser.add_argument("--before", type=str)
-        parser.add_argument("--amount", type=str)
-        parser.add_argument("--signed", action="store_true")
-        parser.add_argument("--full-tx", action="store_true")
-        parser.add_argument("--no-header", action="store_true")
-        parser.add_argument("--limit", type=int)
-        parser.add_argument("--offset", type=int)
-        parser.add_argument("--sort", default="date")
-        parser.add_argument("--reverse", action="store_true")
-
         try:
-            parsed = parser.parse_args(args)
+            parsed = _GREP_PARSER.parse_args(args)
         except SystemExit:
             return
 
@@ -460,14 +609,8 @@ Options are the same as CLI. Example:
             except InvalidPatternError as e:
                 print(f"Error: {e}", file=sys.stderr)
                 return
-            account_set = set(accounts)
         else:
-            accounts = [
-                a
-                for a in self.book.accounts
-                if a.type not in ("ROOT", "TRADING")
-            ]
-            account_set = None
+            accounts = self._accounts
 
         notes_supported = (
             self.book_info.has_notes_column or self.book_info.has_slots_notes
@@ -480,91 +623,77 @@ Options are the same as CLI. Example:
             )
             search_fields.discard("notes")
 
-        notes_map: dict[str, str] = {}
-        if search_notes:
-            all_tx_guids = set()
-            for acc in accounts:
-                for split in acc.splits:
-                    all_tx_guids.add(split.transaction.guid)
-            notes_map = get_transaction_notes_batch(
-                self.book_path,
-                list(all_tx_guids),
-                self.book_info.has_notes_column,
-            )
-
-        # Collect matching splits
-        matching_splits = []
-        seen_tx_guids = set()
-        tx_guids_for_notes = set()
-
+        # Apply the cheap filters first, so notes are only fetched for
+        # transactions that can still match
+        candidates = []
+        signed = parsed.signed
+        # Open date bounds become date.min/date.max so each split
+        # needs a single chained comparison
+        start_date = after_date or date.min
+        end_date = before_date or date.max
         for acc in accounts:
             for split in acc.splits:
                 tx = split.transaction
 
-                if account_set and split.account not in account_set:
+                if not start_date <= tx.post_date < end_date:
                     continue
 
-                tx_date = tx.post_date
-                if after_date and tx_date < after_date:
-                    continue
-                if before_date and tx_date >= before_date:
-                    continue
-
-                split_value = Decimal(str(split.value))
-                if not parsed.signed:
-                    split_value = abs(split_value)
+                split_value = get_split_value(split)
+                if not signed and split_value.is_signed():
+                    split_value = -split_value
                 if min_amt is not None and split_value < min_amt:
                     continue
                 if max_amt is not None and split_value > max_amt:
                     continue
 
-                searchable = ""
-                if "desc" in search_fields:
-                    searchable += tx.description + " "
-                if "memo" in search_fields:
-                    searchable += (split.memo or "") + " "
-                if search_notes:
-                    notes = notes_map.get(tx.guid, "")
-                    if notes:
-                        searchable += notes + " "
-
-                if not pattern.search(searchable):
-                    continue
+                candidates.append((split, tx, acc))
 
-                if parsed.full_tx:
-                    if tx.guid in seen_tx_guids:
-                        continue
-                    seen_tx_guids.add(tx.guid)
+        notes_map: dict[str, str] = {}
+        if search_notes and candidates:
+            notes_map = self._get_notes({tx.guid for _, tx, _ in candidates})
 
+        # Text search over the remaining candidates
+        matching_splits = []
+        first_split_per_tx = {}
+        tx_guids_for_notes = set()
+        search_desc = "desc" in search_fields
+        search_memo = "memo" in search_fields
+        search = pattern.search
+
+        for split, tx, acc in candidates:
+            # Match each selected field separately; stop at the first hit
+            if not (
+                (search_desc and search(tx.description))
+                or (search_memo and split.memo and search(split.memo))
+                or (
+                    search_notes
+                    and tx.guid in notes_map
+                    and search(notes_map[tx.guid])
+                )
+            ):
+                continue
+
+            tx_guids_for_notes.add(tx.guid)
+            if parsed.full_tx:
+                first_split_per_tx.setdefault(tx.guid, (split, tx, acc))
+            else:
                 matching_splits.append((split, tx, acc))
-                tx_guids_for_notes.add(tx.guid)
+
+        if parsed.full_tx:
+            matching_splits = list(first_split_per_tx.values())
 
         if not matching_splits:
             print("No matches found.")
             return
 
         if not search_notes:
-            notes_map = get_transaction_notes_batch(
-                self.book_path,
-                list(tx_guids_for_notes),
-                self.book_info.has_notes_column,
-            )
-
-        # Convert to rows
-        rows = self._splits_to_rows(matching_splits, notes_map, parsed.signed)
-
-        # Sort
-        rows = self._sort_rows(rows, parsed.sort, parsed.reverse)
-
-        if parsed.offset:
-            rows = rows[parsed.offset :]
-        if parsed.limit:
-            rows = rows[: parsed.limit]
+            notes_map = self._get_notes(tx_guids_for_notes)
 
         formatter = OutputFormatter(
             format_type=self.output_format,
             show_header=not parsed.no_header,
             include_notes=search_notes,
+            include_original=False,
         )
 
         if parsed.full_tx:
@@ -572,8 +701,18 @@ Options are the same as CLI. Example:
                 matching_splits, notes_map, parsed.signed
             )
             formatter.format_transactions(tx_rows)
-        else:
-            formatter.format_splits(rows)
+            return
+
+        # Split rows (and their currency conversion) are only needed for
+        # the split listing
+        rows = self._splits_to_rows(matching_splits, notes_map, parsed.signed)
+
+        # Sort; only rows up to the end of the requested page are needed
+        page_end = _page_end(parsed.offset, parsed.limit)
+        rows = _sort_rows(rows, parsed.sort, parsed.reverse, page_end)
+
+        rows = _paginate(rows, parsed.offset, parsed.limit)
+        formatter.format_splits(rows)
 
     def cmd_ledger(self, args: list[str]) -> None:
         """Handle the 'ledger' command in REPL using the open book."""
@@ -581,24 +720,8 @@ Options are the same as CLI. Example:
             print("Usage: ledger ACCOUNT_PATTERN [OPTIONS]", file=sys.stderr)
             return
 
-        import argparse
-
-        parser = argparse.ArgumentParser(prog="ledger")
-        parser.add_argument("account_pattern")
-        parser.add_argument("--account-regex", action="store_true")
-        parser.add_argument("--no-subtree", action="store_true")
-        parser.add_argument("--after", type=str)
-        parser.add_argument("--before", type=str)
-        parser.add_argument("--amount", type=str)
-        parser.add_argument("--signed", action="store_true")
-        parser.add_argument("--no-header", action="store_true")
-        parser.add_argument("--limit", type=int)
-        parser.add_argument("--offset", type=int)
-        parser.add_argument("--sort", default="date")
-        parser.add_argument("--reverse", action="store_true")
-
         try:
-            parsed = parser.parse_args(args)
+            parsed = _LEDGER_PARSER.parse_args(args)
         except SystemExit:
             return
 
@@ -646,20 +769,22 @@ Options are the same as CLI. Example:
 
         splits_data = []
         tx_guids_for_notes = set()
+        signed = parsed.signed
+        # Open date bounds become date.min/date.max so each split
+        # needs a single chained comparison
+        start_date = after_date or date.min
+        end_date = before_date or date.max
 
         for acc in accounts:
             for split in acc.splits:
                 tx = split.transaction
 
-                tx_date = tx.post_date
-                if after_date and tx_date < after_date:
-                    continue
-                if before_date and tx_date >= before_date:
+                if not start_date <= tx.post_date < end_date:
                     continue
 
-                split_value = Decimal(str(split.value))
-                if not parsed.signed:
-                    split_value = abs(split_value)
+                split_value = get_split_value(split)
+                if not signed and split_value.is_signed():
+                    split_value = -split_value
                 if min_amt is not None and split_value < min_amt:
                     continue
                 if max_amt is not None and split_value > max_amt:
@@ -672,23 +797,19 @@ Options are the same as CLI. Example:
             print("No matching splits.")
             return
 
-        notes_map = get_transaction_notes_batch(
-            self.book_path,
-            list(tx_guids_for_notes),
-            self.book_info.has_notes_column,
-        )
+        notes_map = self._get_notes(tx_guids_for_notes)
 
         rows = self._splits_to_rows(splits_data, notes_map, parsed.signed)
-        rows = self._sort_rows(rows, parsed.sort, parsed.reverse)
+        # Only rows up to the end of the requested page are needed
+        page_end = _page_end(parsed.offset, parsed.limit)
+        rows = _sort_rows(rows, parsed.sort, parsed.reverse, page_end)
 
-        if parsed.offset:
-            rows = rows[parsed.offset :]
-        if parsed.limit:
-            rows = rows[: parsed.limit]
+        rows = _paginate(rows, parsed.offset, parsed.limit)
 
         formatter = OutputFormatter(
             format_type=self.output_format,
             show_header=not parsed.no_header,
+            include_original=False,
         )
         formatter.format_splits(rows)
 
@@ -699,19 +820,12 @@ Options are the same as CLI. Example:
             return
 
         guid = args[0]
-        tx = None
-        for t in self.book.transactions:
-            if t.guid == guid:
-                tx = t
-                break
-
+        tx = self._find_transaction(guid)
         if tx is None:
             print(f"Transaction not found: {guid}", file=sys.stderr)
             return
 
-        notes = get_transaction_notes(
-            self.book_path, tx.guid, self.book_info.has_notes_column
-        )
+        notes = self._get_notes([tx.guid]).get(tx.guid)
 
         split_rows = []
         for split in tx.splits:
@@ -723,7 +837,7 @@ Options are the same as CLI. Example:
                     account=_account_name(acc.fullname, self.full_account),
                     memo=split.memo,
                     notes=notes,
-                    amount=Decimal(str(split.value)),
+                    amount=get_split_value(split),
                     currency=acc.commodity.mnemonic if acc.commodity else "",
                     fx_rate=None,
                     tx_guid=tx.guid,
@@ -739,7 +853,9 @@ Options are the same as CLI. Example:
             splits=split_rows,
         )
 
-        formatter = OutputFormatter(format_type=self.output_format)
+        formatter = OutputFormatter(
+            format_type=self.output_format, include_original=False
+        )
         formatter.format_transactions([tx_row])
 
     def cmd_split(self, args: list[str]) -> None:
@@ -749,27 +865,13 @@ Options are the same as CLI. Example:
             return
 
         guid = args[0]
-        found_split = None
-        found_tx = None
-        found_acc = None
-
-        for acc in self.book.accounts:
-            for split in acc.splits:
-                if split.guid == guid:
-                    found_split = split
-                    found_tx = split.transaction
-                    found_acc = acc
-                    break
-            if found_split:
-                break
-
+        found_split, found_acc = self._find_split(guid)
         if found_split is None:
             print(f"Split not found: {guid}", file=sys.stderr)
             return
+        found_tx = found_split.transaction
 
-        notes = get_transaction_notes(
-            self.book_path, found_tx.guid, self.book_info.has_notes_column
-        )
+        notes = self._get_notes([found_tx.guid]).get(found_tx.guid)
 
         row = SplitRow(
             date=found_tx.post_date,
@@ -777,7 +879,7 @@ Options are the same as CLI. Example:
             account=_account_name(found_acc.fullname, self.full_account),
             memo=found_split.memo,
             notes=notes,
-            amount=Decimal(str(found_split.value)),
+            amount=get_split_value(found_split),
             currency=(
                 found_acc.commodity.mnemonic if found_acc.commodity else ""
             ),
@@ -786,7 +888,9 @@ Options are the same as CLI. Example:
             split_guid=found_split.guid,
         )
 
-        formatter = OutputFormatter(format_type=self.output_format)
+        formatter = OutputFormatter(
+            format_type=self.output_format, include_original=False
+        )
         formatter.format_splits([row])
 
     def _splits_to_rows(
@@ -797,49 +901,64 @@ Options are the same as CLI. Example:
     ) -> list[SplitRow]:
         """Convert split/tx/acc tuples to SplitRow objects."""
         rows = []
-        converter = CurrencyConverter(
-            self.book_path,
-            base_currency=self.base_currency,
-            lookback_days=self.config.fx_lookback_days,
-        )
         currency_mode = self.currency_mode
 
-        account_currencies = get_account_currencies(
-            [acc for _, _, acc in splits_data]
+        # Unzip once for the currency checks; accounts repeat across splits,
+        # so each distinct account is inspected once
+        splits, _, accounts = (
+            zip(*splits_data) if splits_data else ((), (), ())
         )
+        distinct_accounts = set(accounts)
+        account_currencies = get_account_currencies(distinct_accounts)
         target_currency = determine_display_currency(
             currency_mode,
-            [s for s, _, _ in splits_data],
+            splits,
             account_currencies,
             self.base_currency,
         )
 
+        # Resolve each distinct account's currency and display name once
+        account_info = {
+            acc: (
+                acc.commodity.mnemonic if acc.commodity else "???",
+                _account_name(acc.fullname, self.full_account),
+            )
+            for acc in distinct_accounts
+        }
+
+        # Look up every exchange rate the rows need in one batch
+        rates = {}
+        if target_currency:
+            needed = set()
+            for _, tx, acc in splits_data:
+                split_currency = account_info[acc][0]
+                if split_currency != target_currency:
+                    needed.add((split_currency, target_currency, tx.post_date))
+            if needed:
+                rates = self._get_converter().rates_for(needed)
+
         for split, tx, acc in splits_data:
-            split_value = Decimal(str(split.value))
-            if not signed:
-                split_value = abs(split_value)
+            split_value = get_split_value(split)
+            if not signed and split_value.is_signed():
+                split_value = -split_value
 
-            split_currency = acc.commodity.mnemonic if acc.commodity else "???"
+            split_currency, display_account = account_info[acc]
+            fx_rate = None
             if target_currency and target_currency != split_currency:
-                result = converter.convert(
-                    split_value,
-                    split_currency,
-                    target_currency,
-                    tx.post_date,
-                )
-                display_amount = result.amount
-                display_currency = result.currency
-                fx_rate = result.fx_rate if result.converted else None
+                rate_key = (split_currency, target_currency, tx.post_date)
+                fx_rate = rates[rate_key]
+            if fx_rate is not None:
+                display_amount = split_value * fx_rate
+                display_currency = target_currency
             else:
                 display_amount = split_value
                 display_currency = split_currency
-                fx_rate = None
             notes = notes_map.get(tx.guid)
 
             row = SplitRow(
                 date=tx.post_date,
                 description=tx.description,
-                account=_account_name(acc.fullname, self.full_account),
+                account=display_account,
                 memo=split.memo,
                 notes=notes,
                 amount=display_amount,
@@ -856,23 +975,30 @@ Options are the same as CLI. Example:
         matching_set = set(matching_accounts)
         result_set = set(matching_accounts)
 
+        # Add all ancestors of matching accounts, stopping at any ancestor
+        # whose own chain has already been walked
+        walked = set()
         for acc in matching_accounts:
             parent = acc.parent
-            while parent is not None:
+            while parent is not None and parent not in walked:
+                walked.add(parent)
                 if parent.type not in ("ROOT", "TRADING"):
                     result_set.add(parent)
                 parent = parent.parent
 
-        all_accounts = [
-            a for a in self.book.accounts if a.type not in ("ROOT", "TRADING")
-        ]
-        for acc in all_accounts:
-            parent = acc.parent
-            while parent is not None:
-                if parent in matching_set:
-                    result_set.add(acc)
-                    break
-                parent = parent.parent
+        # Add all descendants of matching accounts: index children by parent
+        # once, then walk down from each match
+        children: dict = {}
+        for acc in self._accounts:
+            children.setdefault(acc.parent, []).append(acc)
+        below_match = set(matching_set)
+        stack = list(matching_set)
+        while stack:
+            for child in children.get(stack.pop(), ()):
+                if child not in below_match:
+                    below_match.add(child)
+                    stack.append(child)
+        result_set |= below_match
 
         return list(result_set)
 
@@ -883,74 +1009,57 @@ Options are the same as CLI. Example:
         signed: bool,
     ) -> list[TransactionRow]:
         """Convert split data to TransactionRow objects."""
+        # Group by transaction, building each transaction's rows once
         tx_map = {}
+        # Display name and currency per account, shared across transactions
+        account_info = {}
         for split, tx, acc in splits_data:
-            if tx.guid not in tx_map:
-                tx_map[tx.guid] = {
-                    "tx": tx,
-                    "notes": notes_map.get(tx.guid),
-                    "splits": [],
-                }
+            if tx.guid in tx_map:
+                continue
+            notes = notes_map.get(tx.guid)
 
+            # Fields shared by every split of the transaction are read once
+            post_date = tx.post_date
+            description = tx.description
+            tx_guid = tx.guid
+            split_rows = []
             for s in tx.splits:
                 split_acc = s.account
-                split_value = Decimal(str(s.value))
-                if not signed:
-                    split_value = abs(split_value)
+                acc_info = account_info.get(split_acc)
+                if acc_info is None:
+                    commodity = split_acc.commodity
+                    acc_info = account_info[split_acc] = (
+                        _account_name(split_acc.fullname, self.full_account),
+                        commodity.mnemonic if commodity else "",
+                    )
+                split_value = get_split_value(s)
+                if not signed and split_value.is_signed():
+                    split_value = -split_value
 
-                tx_map[tx.guid]["splits"].append(
+                split_rows.append(
                     SplitRow(
-                        date=tx.post_date,
-                        description=tx.description,
-                        account=_account_name(
-                            split_acc.fullname, self.full_account
-                        ),
+                        date=post_date,
+                        description=description,
+                        account=acc_info[0],
                         memo=s.memo,
-                        notes=tx_map[tx.guid]["notes"],
+                        notes=notes,
                         amount=split_value,
-                        currency=(
-                            split_acc.commodity.mnemonic
-                            if split_acc.commodity
-                            else ""
-                        ),
+                        currency=acc_info[1],
                         fx_rate=None,
-                        tx_guid=tx.guid,
+                        tx_guid=tx_guid,
                         split_guid=s.guid,
                     )
                 )
 
-        rows = []
-        for guid, data in tx_map.items():
-            seen = set()
-            unique_splits = []
-            for s in data["splits"]:
-                if s.split_guid not in seen:
-                    seen.add(s.split_guid)
-                    unique_splits.append(s)
-
-            rows.append(
-                TransactionRow(
-                    tx_guid=guid,
-                    date=data["tx"].post_date,
-                    description=data["tx"].description,
-                    notes=data["notes"],
-                    splits=unique_splits,
-                )
+            tx_map[tx_guid] = TransactionRow(
+                tx_guid=tx_guid,
+                date=post_date,
+                description=description,
+                notes=notes,
+                splits=split_rows,
             )
-        return rows
 
-    def _sort_rows(
-        self, rows: list[SplitRow], sort_key: str, reverse: bool
-    ) -> list[SplitRow]:
-        """Sort split rows by the specified key."""
-        key_map = {
-            "date": lambda r: r.date,
-            "amount": lambda r: r.amount,
-            "account": lambda r: r.account,
-            "description": lambda r: r.description,
-        }
-        key_fn = key_map.get(sort_key, key_map["date"])
-        return sorted(rows, key=key_fn, reverse=reverse)
+        return list(tx_map.values())
 
 
 def run_repl(config: Config) -> int:
@@ -977,9 +1086,10 @@ def run_repl(config: Config) -> int:
     try:
         while session.running:
             try:
-                prompt = "gcg> " if session.book else "gcg (no book)> "
+                prompt = _PROMPT_BOOK if session.book else _PROMPT_NO_BOOK
                 line = input(prompt)
                 session.run_command(line)
+                session.save_history()
             except EOFError:
                 print()
                 break
@@ -1,36 +1,56 @@
 """Tests for CLI argument parsing and date/amount range handling."""
 
 import argparse
+import subprocess
+import sys
 from datetime import date
 from decimal import Decimal
+from types import SimpleNamespace
 
 import pytest
 
-# Skip all tests if piecash is not available (required by gcg.cli)
+# Skip all tests if piecash is not available (required to open books)
 pytest.importorskip("piecash")
 
+from gcg.cli import (  # noqa: E402
+    _page_end,
+    _paginate,
+    _prune_to_matching_paths,
+    _sort_rows,
+    create_parser,
+    parse_amount_range,
+    parse_date,
+    parse_date_range,
+    resolve_date_filters,
+)
+from gcg.output import SplitRow  # noqa: E402
+
 
 class TestDateParsing:
     """Tests for date parsing functions."""
 
     def test_parse_date_valid(self):
         """Valid date string should parse correctly."""
-        from gcg.cli import parse_date
-
         result = parse_date("2026-01-15")
         assert result == date(2026, 1, 15)
 
+    def test_parse_date_unpadded(self):
+        """Unpadded month and day should still parse."""
+        assert parse_date("2026-1-5") == date(2026, 1, 5)
+
+    def test_parse_date_rejects_other_iso_forms(self):
+        """Only YYYY-MM-DD should be accepted, not other ISO 8601 forms."""
+        for value in ("20260115", "2026-W03-4"):
+            with pytest.raises(argparse.ArgumentTypeError):
+                parse_date(value)
+
     def test_parse_date_invalid_format(self):
         """Invalid date format should raise ArgumentTypeError."""
-        from gcg.cli import parse_date
-
         with pytest.raises(argparse.ArgumentTypeError):
             parse_date("01-15-2026")
 
     def test_parse_date_invalid_date(self):
         """Invalid date value should raise ArgumentTypeError."""
-        from gcg.cli import parse_date
-
         with pytest.raises(argparse.ArgumentTypeError):
             parse_date("2026-13-01")  # Invalid month
 
@@ -40,39 +60,38 @@ class TestDateRangeParsing:
 
     def test_parse_date_range_full(self):
         """Full date range A..B should parse both dates."""
-        from gcg.cli import parse_date_range
-
         start, end = parse_date_range("2026-01-01..2026-01-31")
         assert start == date(2026, 1, 1)
         assert end == date(2026, 1, 31)
 
     def test_parse_date_range_open_end(self):
         """Open-ended range A.. should have None end."""
-        from gcg.cli import parse_date_range
-
         start, end = parse_date_range("2026-01-01..")
         assert start == date(2026, 1, 1)
         assert end is None
 
     def test_parse_date_range_open_start(self):
         """Open-start range ..B should have None start."""
-        from gcg.cli import parse_date_range
-
         start, end = parse_date_range("..2026-01-31")
         assert start is None
         assert end == date(2026, 1, 31)
 
     def test_parse_date_range_no_dots(self):
         """Range without .. should raise error."""
-        from gcg.cli import parse_date_range
-
-        with pytest.raises(argparse.ArgumentTypeError):
+        with pytest.raises(
+            argparse.ArgumentTypeError, match="Invalid date range"
+        ):
             parse_date_range("2026-01-01")
 
+    def test_parse_date_range_bad_endpoint(self):
+        """A malformed endpoint should fail as a date, not as a range."""
+        with pytest.raises(
+            argparse.ArgumentTypeError, match="Invalid date format"
+        ):
+            parse_date_range("2026-01-01..tomorrow")
+
     def test_parse_date_range_whitespace(self):
         """Whitespace around dates should be handled."""
-        from gcg.cli import parse_date_range
-
         start, end = parse_date_range(" 2026-01-01 .. 2026-01-31 ")
         assert start == date(2026, 1, 1)
         assert end == date(2026, 1, 31)
@@ -83,48 +102,47 @@ class TestAmountRangeParsing:
 
     def test_parse_amount_range_full(self):
         """Full amount range MIN..MAX should parse both values."""
-        from gcg.cli import parse_amount_range
-
         min_amt, max_amt = parse_amount_range("10..100")
         assert min_amt == Decimal("10")
         assert max_amt == Decimal("100")
 
     def test_parse_amount_range_open_max(self):
         """Open-max range MIN.. should have None max."""
-        from gcg.cli import parse_amount_range
-
         min_amt, max_amt = parse_amount_range("10..")
         assert min_amt == Decimal("10")
         assert max_amt is None
 
     def test_parse_amount_range_open_min(self):
         """Open-min range ..MAX should have None min."""
-        from gcg.cli import parse_amount_range
-
         min_amt, max_amt = parse_amount_range("..100")
         assert min_amt is None
         assert max_amt == Decimal("100")
 
     def test_parse_amount_range_decimals(self):
         """Decimal amounts should parse correctly."""
-        from gcg.cli import parse_amount_range
-
         min_amt, max_amt = parse_amount_range("10.50..99.99")
         assert min_amt == Decimal("10.50")
         assert max_amt == Decimal("99.99")
 
+    def test_parse_amount_range_cached(self):
+        """Repeated ranges should be served from the parser's cache."""
+        first = parse_amount_range("1.25..7.5")
+        hits = parse_amount_range.cache_info().hits
+        assert parse_amount_range("1.25..7.5") is first
+        assert parse_amount_range.cache_info().hits == hits + 1
+
     def test_parse_amount_range_no_dots(self):
         """Range without .. should raise error."""
-        from gcg.cli import parse_amount_range
-
-        with pytest.raises(argparse.ArgumentTypeError):
+        with pytest.raises(
+            argparse.ArgumentTypeError, match="Invalid amount range"
+        ):
             parse_amount_range("100")
 
     def test_parse_amount_range_invalid_number(self):
         """Invalid number should raise error."""
-        from gcg.cli import parse_amount_range
-
-        with pytest.raises(argparse.ArgumentTypeError):
+        with pytest.raises(
+            argparse.ArgumentTypeError, match="Invalid amount in range"
+        ):
             parse_amount_range("abc..100")
 
 
@@ -133,54 +151,34 @@ class TestResolveDateFilters:
 
     def test_resolve_after_only(self):
         """--after alone should set start date."""
-        from gcg.cli import resolve_date_filters
-
-        class Args:
-            after = date(2026, 1, 1)
-            before = None
-            date = None
-
-        after, before = resolve_date_filters(Args())
+        args = SimpleNamespace(after=date(2026, 1, 1), before=None, date=None)
+        after, before = resolve_date_filters(args)
         assert after == date(2026, 1, 1)
         assert before is None
 
     def test_resolve_before_only(self):
         """--before alone should set end date."""
-        from gcg.cli import resolve_date_filters
-
-        class Args:
-            after = None
-            before = date(2026, 2, 1)
-            date = None
-
-        after, before = resolve_date_filters(Args())
+        args = SimpleNamespace(after=None, before=date(2026, 2, 1), date=None)
+        after, before = resolve_date_filters(args)
         assert after is None
         assert before == date(2026, 2, 1)
 
     def test_resolve_date_range(self):
         """--date range should set both with +1 day adjustment."""
-        from gcg.cli import resolve_date_filters
-
-        class Args:
-            after = None
-            before = None
-            date = (date(2026, 1, 1), date(2026, 1, 31))
-
-        after, before = resolve_date_filters(Args())
+        args = SimpleNamespace(
+            after=None, before=None, date=(date(2026, 1, 1), date(2026, 1, 31))
+        )
+        after, before = resolve_date_filters(args)
         assert after == date(2026, 1, 1)
         # End should be +1 day because --date is inclusive
         assert before == date(2026, 2, 1)
 
     def test_resolve_date_range_open_end(self):
         """--date A.. should only set start."""
-        from gcg.cli import resolve_date_filters
-
-        class Args:
-            after = None
-            before = None
-            date = (date(2026, 1, 1), None)
-
-        after, before = resolve_date_filters(Args())
+        args = SimpleNamespace(
+            after=None, before=None, date=(date(2026, 1, 1), None)
+        )
+        after, before = resolve_date_filters(args)
         assert after == date(2026, 1, 1)
         assert before is None
 
@@ -190,121 +188,221 @@ class TestParserCreation:
 
     def test_parser_creates(self):
         """Parser should create without errors."""
-        from gcg.cli import create_parser
-
         parser = create_parser()
         assert parser is not None
 
-    def test_parser_accounts_command(self):
-        """accounts command should parse correctly."""
-        from gcg.cli import create_parser
-
-        parser = create_parser()
-        args = parser.parse_args(["accounts", "Bank"])
-        assert args.command == "accounts"
-        assert args.pattern == "Bank"
-
-    def test_parser_accounts_with_options(self):
-        """accounts with options should parse correctly."""
-        from gcg.cli import create_parser
-
+    def test_parser_built_once(self):
+        """Repeated calls should share one parser without leaking state."""
         parser = create_parser()
-        args = parser.parse_args(
-            ["accounts", "^Expenses:", "--regex", "--show-guids"]
+        assert create_parser() is parser
+        first = parser.parse_args(["grep", "amazon", "--signed"])
+        second = parser.parse_args(["grep", "tesco"])
+        assert first.signed is True
+        assert second.signed is False
+        assert second.text == "tesco"
+
+    def test_import_does_not_load_piecash(self):
+        """Importing the CLI should leave piecash until a book is opened."""
+        code = (
+            "import sys, gcg.cli; "
+            "sys.exit('piecash' in sys.modules or 'sqlalchemy' in sys.modules)"
         )
-        assert args.command == "accounts"
-        assert args.pattern == "^Expenses:"
-        assert args.regex is True
-        assert args.show_guids is True
-
-    def test_parser_grep_command(self):
-        """grep command should parse correctly."""
-        from gcg.cli import create_parser
-
-        parser = create_parser()
-        args = parser.parse_args(["grep", "amazon"])
-        assert args.command == "grep"
-        assert args.text == "amazon"
-
-    def test_parser_grep_with_filters(self):
-        """grep with date and amount filters should parse."""
-        from gcg.cli import create_parser
-
-        parser = create_parser()
-        args = parser.parse_args(
-            [
-                "grep",
-                "amazon",
-                "--after",
-                "2026-01-01",
-                "--amount",
-                "10..100",
-                "--signed",
-            ]
+        assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+
+    @pytest.mark.parametrize(
+        "argv, expected",
+        [
+            pytest.param(
+                ["accounts", "Bank"],
+                {"command": "accounts", "pattern": "Bank"},
+                id="accounts",
+            ),
+            pytest.param(
+                ["accounts", "^Expenses:", "--regex", "--show-guids"],
+                {
+                    "command": "accounts",
+                    "pattern": "^Expenses:",
+                    "regex": True,
+                    "show_guids": True,
+                },
+                id="accounts-options",
+            ),
+            pytest.param(
+                ["grep", "amazon"],
+                {"command": "grep", "text": "amazon"},
+                id="grep",
+            ),
+            pytest.param(
+                [
+                    "grep",
+                    "amazon",
+                    "--after",
+                    "2026-01-01",
+                    "--amount",
+                    "10..100",
+                    "--signed",
+                ],
+                {
+                    "command": "grep",
+                    "text": "amazon",
+                    "after": date(2026, 1, 1),
+                    "amount": (Decimal("10"), Decimal("100")),
+                    "signed": True,
+                },
+                id="grep-filters",
+            ),
+            pytest.param(
+                ["ledger", "Assets:Bank"],
+                {"command": "ledger", "account_pattern": "Assets:Bank"},
+                id="ledger",
+            ),
+            pytest.param(
+                ["tx", "abc123-guid"],
+                {"command": "tx", "guid": "abc123-guid"},
+                id="tx",
+            ),
+            pytest.param(
+                [
+                    "--format",
+                    "json",
+                    "--no-header",
+                    "--sort",
+                    "amount",
+                    "--reverse",
+                    "--limit",
+                    "10",
+                    "accounts",
+                    "Bank",
+                ],
+                {
+                    "format": "json",
+                    "no_header": True,
+                    "sort": "amount",
+                    "reverse": True,
+                    "limit": 10,
+                },
+                id="global-options",
+            ),
+            pytest.param(["-i"], {"interactive": True}, id="interactive"),
+            pytest.param(
+                ["cache", "build", "--force"],
+                {"command": "cache", "action": "build", "force": True},
+                id="cache",
+            ),
+        ],
+    )
+    def test_parse_args(self, argv, expected):
+        """Each command line should parse to the expected attributes."""
+        args = create_parser().parse_args(argv)
+        for name, value in expected.items():
+            assert getattr(args, name) == value
+
+
+class TestPaginate:
+    """Tests for applying --offset and --limit."""
+
+    def test_paginate_offset_and_limit(self):
+        """Offset and limit together should select one window."""
+        assert _paginate(list(range(10)), 3, 4) == [3, 4, 5, 6]
+
+    def test_paginate_offset_or_limit_only(self):
+        """Either bound alone should apply on its own."""
+        assert _paginate(list(range(5)), 3, None) == [3, 4]
+        assert _paginate(list(range(5)), None, 2) == [0, 1]
+        assert _paginate(list(range(3)), None, None) == [0, 1, 2]
+
+    def test_paginate_negative_values(self):
+        """Negative values should slice from the end, one step at a time."""
+        rows = list(range(5))
+        for offset, limit in [(-2, 2), (-3, 1), (1, -1), (-4, -1), (-2, None)]:
+            expected = rows[offset:] if offset else rows
+            expected = expected[:limit] if limit else expected
+            assert _paginate(rows, offset, limit) == expected
+        assert _paginate(rows, -2, 2) == [3, 4]
+
+
+class TestSortRows:
+    """Tests for sorting split rows."""
+
+    @pytest.fixture
+    def rows(self):
+        """Rows with repeated amounts, to check tie ordering."""
+        return [
+            SplitRow(
+                date=date(2026, 1, day),
+                description=f"tx {day}",
+                account="Checking",
+                memo=None,
+                notes=None,
+                amount=Decimal(day % 3),
+                currency="EUR",
+                fx_rate=None,
+                tx_guid=f"tx{day}",
+                split_guid=f"split{day}",
+            )
+            for day in range(1, 11)
+        ]
+
+    @pytest.mark.parametrize("reverse", [False, True])
+    def test_sort_rows_count_matches_full_sort(self, rows, reverse):
+        """A limited sort should return the head of the full sort."""
+        full = _sort_rows(rows, "amount", reverse)
+        assert _sort_rows(rows, "amount", reverse, 4) == full[:4]
+        assert _sort_rows(rows, "amount", reverse, 20) == full
+
+    @pytest.mark.parametrize(
+        "offset, limit", [(2, 3), (-3, 2), (-1, 5), (1, -2), (None, None)]
+    )
+    def test_sort_rows_page_matches_full_sort(self, rows, offset, limit):
+        """Sorting up to the page end should not change the page."""
+        full = _paginate(_sort_rows(rows, "amount", False), offset, limit)
+        count = _page_end(offset, limit)
+        page = _paginate(
+            _sort_rows(rows, "amount", False, count), offset, limit
         )
-        assert args.command == "grep"
-        assert args.text == "amazon"
-        assert args.after == date(2026, 1, 1)
-        assert args.amount == (Decimal("10"), Decimal("100"))
-        assert args.signed is True
-
-    def test_parser_ledger_command(self):
-        """ledger command should parse correctly."""
-        from gcg.cli import create_parser
-
-        parser = create_parser()
-        args = parser.parse_args(["ledger", "Assets:Bank"])
-        assert args.command == "ledger"
-        assert args.account_pattern == "Assets:Bank"
-
-    def test_parser_tx_command(self):
-        """tx command should parse correctly."""
-        from gcg.cli import create_parser
-
-        parser = create_parser()
-        args = parser.parse_args(["tx", "abc123-guid"])
-        assert args.command == "tx"
-        assert args.guid == "abc123-guid"
-
-    def test_parser_global_options(self):
-        """Global options should parse correctly."""
-        from gcg.cli import create_parser
-
-        parser = create_parser()
-        args = parser.parse_args(
-            [
-                "--format",
-                "json",
-                "--no-header",
-                "--sort",
-                "amount",
-                "--reverse",
-                "--limit",
-                "10",
-                "accounts",
-                "Bank",
-            ]
+        assert page == full
+
+
+class TestPruneToMatchingPaths:
+    """Tests for pruning the account tree to matching paths."""
+
+    def test_prune_keeps_ancestors_and_descendants(self):
+        """Ancestors and subtrees of matches should be kept."""
+
+        class Account:
+            def __init__(self, name, parent, type_="ASSET"):
+                self.name = name
+                self.parent = parent
+                self.type = type_
+
+        root = Account("root", None, "ROOT")
+        assets = Account("Assets", root)
+        bank = Account("Bank", assets)
+        checking = Account("Checking", bank)
+        sub = Account("Sub", checking)
+        cash = Account("Cash", assets)
+        expenses = Account("Expenses", root)
+        food = Account("Food", expenses)
+        book = SimpleNamespace(
+            accounts=[root, assets, bank, checking, sub, cash, expenses, food]
         )
-        assert args.format == "json"
-        assert args.no_header is True
-        assert args.sort == "amount"
-        assert args.reverse is True
-        assert args.limit == 10
 
-    def test_parser_interactive_flag(self):
-        """Interactive flag should parse."""
-        from gcg.cli import create_parser
-
-        parser = create_parser()
-        args = parser.parse_args(["-i"])
-        assert args.interactive is True
-
-    def test_parser_cache_command(self):
-        """cache command should parse correctly."""
-        from gcg.cli import create_parser
-
-        parser = create_parser()
-        args = parser.parse_args(["cache", "build", "--force"])
-        assert args.command == "cache"
-        assert args.action == "build"
-        assert args.force is True
+        result = _prune_to_matching_paths([bank, food], book)
+        assert {a.name for a in result} == {
+            "Assets",
+            "Bank",
+            "Checking",
+            "Sub",
+            "Expenses",
+            "Food",
+        }
+
+        # A match nested under another match keeps the whole outer subtree
+        result = _prune_to_matching_paths([assets, checking], book)
+        assert {a.name for a in result} == {
+            "Assets",
+            "Bank",
+            "Checking",
+            "Sub",
+            "Cash",
+        }
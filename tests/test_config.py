@@ -1,5 +1,6 @@
 """Tests for configuration loading."""
 
+import os
 from pathlib import Path
 
 from gcg.config import (
@@ -10,6 +11,7 @@ from gcg.config import (
     get_xdg_cache_home,
     get_xdg_state_home,
     load_config,
+    load_config_file,
 )
 
 
@@ -117,3 +119,28 @@ class TestLoadConfig:
         assert config.output_format == "csv"
         assert config.base_currency == DEFAULT_BASE_CURRENCY
         assert config.fx_lookback_days == DEFAULT_FX_LOOKBACK_DAYS
+
+
+class TestLoadConfigFile:
+    """Tests for reading the XDG config file."""
+
+    def test_missing_file_returns_empty(self, monkeypatch, tmp_path):
+        """A missing config file should yield an empty dict."""
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+        assert load_config_file() == {}
+
+    def test_reloads_when_file_changes(self, monkeypatch, tmp_path):
+        """Cached config should be re-read once the file's mtime changes."""
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+        config_file = tmp_path / "gcg" / "config.toml"
+        config_file.parent.mkdir()
+        config_file.write_text('[currency]\nbase = "USD"\n')
+
+        first = load_config_file()
+        assert first["currency"]["base"] == "USD"
+        assert load_config_file() is first
+
+        config_file.write_text('[currency]\nbase = "GBP"\n')
+        stat = config_file.stat()
+        os.utime(config_file, (stat.st_atime, stat.st_mtime + 10))
+        assert load_config_file()["currency"]["base"] == "GBP"
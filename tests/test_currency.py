@@ -1,9 +1,14 @@
 """Tests for currency conversion."""
 
+import sqlite3
+from datetime import date
 from decimal import Decimal
 
+import pytest
+
 from gcg.currency import (
     ConversionResult,
+    CurrencyConverter,
     determine_display_currency,
     get_account_currencies,
 )
@@ -141,3 +146,59 @@ class TestGetAccountCurrencies:
         accounts = [MockAccount(), MockAccount()]
         result = get_account_currencies(accounts)
         assert result == set()
+
+
+class TestRatesFor:
+    """Tests for batched exchange rate lookup."""
+
+    @pytest.fixture
+    def price_db(self, tmp_path):
+        """Minimal price database with one GBP->EUR quote."""
+        db_path = tmp_path / "prices.sqlite"
+        conn = sqlite3.connect(db_path)
+        conn.executescript("""
+            CREATE TABLE commodities (guid TEXT, mnemonic TEXT);
+            CREATE TABLE prices (
+                commodity_guid TEXT, currency_guid TEXT, date TEXT,
+                value_num INTEGER, value_denom INTEGER
+            );
+            INSERT INTO commodities VALUES ('g', 'GBP'), ('e', 'EUR');
+            INSERT INTO prices VALUES ('g', 'e', '2024-01-10', 115, 100);
+            """)
+        conn.commit()
+        conn.close()
+        return db_path
+
+    def test_rates_for_direct_inverse_and_missing(self, price_db):
+        """Each key should map to its rate, or None when not found."""
+        converter = CurrencyConverter(price_db, lookback_days=30)
+        on_date = date(2024, 1, 15)
+        rates = converter.rates_for(
+            [
+                ("GBP", "EUR", on_date),
+                ("EUR", "GBP", on_date),
+                ("USD", "EUR", on_date),
+                ("EUR", "EUR", on_date),
+            ]
+        )
+        assert rates[("GBP", "EUR", on_date)] == Decimal("1.15")
+        assert rates[("EUR", "GBP", on_date)] == 1 / Decimal("1.15")
+        assert rates[("USD", "EUR", on_date)] is None
+        assert rates[("EUR", "EUR", on_date)] == Decimal("1")
+
+    def test_rates_for_uses_one_connection(self, price_db, monkeypatch):
+        """Uncached lookups should share a single connection."""
+        connects = []
+        real_connect = sqlite3.connect
+
+        def counting_connect(*args, **kwargs):
+            connects.append(args)
+            return real_connect(*args, **kwargs)
+
+        monkeypatch.setattr(sqlite3, "connect", counting_connect)
+        converter = CurrencyConverter(price_db, lookback_days=30)
+        keys = [("GBP", "EUR", date(2024, 1, day)) for day in range(10, 20)]
+        rates = converter.rates_for(keys)
+
+        assert len(connects) == 1
+        assert all(rates[key] == Decimal("1.15") for key in keys)
@@ -22,188 +22,205 @@ class TestBookOpening:
             assert info.account_count > 0
             assert info.transaction_count > 0
 
-    def test_book_info_counts(self, test_book_path):
+    def test_book_info_counts(self, opened_book):
         """Book info should have correct counts."""
-        from gcg.book import open_gnucash_book
+        book, info = opened_book
+        # We created specific accounts and transactions
+        assert info.account_count >= 9  # At least our created accounts
+        assert info.transaction_count == 6
 
-        with open_gnucash_book(test_book_path) as (book, info):
-            # We created specific accounts and transactions
-            assert info.account_count >= 9  # At least our created accounts
-            assert info.transaction_count == 6
+    def test_split_values_are_decimal(self, opened_book):
+        """Split values should come back as Decimal without conversion."""
+        from decimal import Decimal
+
+        from gcg.book import get_split_value
+
+        book, info = opened_book
+        for tx in book.transactions:
+            for split in tx.splits:
+                value = get_split_value(split)
+                assert isinstance(value, Decimal)
+                assert value == split.value
 
 
 class TestAccountSearch:
     """Tests for account search functionality."""
 
-    def test_find_account_by_substring(self, test_book_path):
+    def test_find_account_by_substring(self, opened_book):
         """Should find accounts by substring."""
-        from gcg.book import get_account_by_pattern, open_gnucash_book
+        from gcg.book import get_account_by_pattern
 
-        with open_gnucash_book(test_book_path) as (book, info):
-            accounts = get_account_by_pattern(book, "Bank")
-            names = [a.fullname for a in accounts]
-            assert any("Bank" in n for n in names)
+        book, info = opened_book
+        accounts = get_account_by_pattern(book, "Bank")
+        names = [a.fullname for a in accounts]
+        assert any("Bank" in n for n in names)
 
-    def test_find_account_case_insensitive(self, test_book_path):
+    def test_find_account_case_insensitive(self, opened_book):
         """Search should be case-insensitive by default."""
-        from gcg.book import get_account_by_pattern, open_gnucash_book
+        from gcg.book import get_account_by_pattern
 
-        with open_gnucash_book(test_book_path) as (book, info):
-            accounts1 = get_account_by_pattern(book, "bank")
-            accounts2 = get_account_by_pattern(book, "BANK")
-            assert len(accounts1) == len(accounts2)
+        book, info = opened_book
+        accounts1 = get_account_by_pattern(book, "bank")
+        accounts2 = get_account_by_pattern(book, "BANK")
+        assert len(accounts1) == len(accounts2)
 
-    def test_find_account_with_subtree(self, test_book_path):
+    def test_find_account_with_subtree(self, opened_book):
         """Should include subtree accounts by default."""
-        from gcg.book import get_account_by_pattern, open_gnucash_book
+        from gcg.book import get_account_by_pattern
 
-        with open_gnucash_book(test_book_path) as (book, info):
-            # Searching for "Food" should include Groceries and Restaurants
-            accounts = get_account_by_pattern(book, "Food")
-            names = [a.fullname for a in accounts]
-            assert any("Food" in n for n in names)
-            assert any("Groceries" in n for n in names)
-            assert any("Restaurants" in n for n in names)
-
-    def test_find_account_without_subtree(self, test_book_path):
+        book, info = opened_book
+        # Searching for "Food" should include Groceries and Restaurants
+        accounts = get_account_by_pattern(book, "Food")
+        names = [a.fullname for a in accounts]
+        assert any("Food" in n for n in names)
+        assert any("Groceries" in n for n in names)
+        assert any("Restaurants" in n for n in names)
+
+    def test_find_account_without_subtree(self, opened_book):
         """Should exclude subtree when requested."""
-        from gcg.book import get_account_by_pattern, open_gnucash_book
+        from gcg.book import get_account_by_pattern
 
-        with open_gnucash_book(test_book_path) as (book, info):
-            # Use regex to match exactly "Assets:Bank" (ending in Bank)
-            # With subtree should include descendants (Checking, Savings)
-            accounts_with = get_account_by_pattern(
-                book, "Assets:Bank$", is_regex=True, include_subtree=True
-            )
-            accounts_without = get_account_by_pattern(
-                book, "Assets:Bank$", is_regex=True, include_subtree=False
-            )
+        book, info = opened_book
+        # Use regex to match exactly "Assets:Bank" (ending in Bank)
+        # With subtree should include descendants (Checking, Savings)
+        accounts_with = get_account_by_pattern(
+            book, "Assets:Bank$", is_regex=True, include_subtree=True
+        )
+        accounts_without = get_account_by_pattern(
+            book, "Assets:Bank$", is_regex=True, include_subtree=False
+        )
 
-            # With subtree should include Checking and Savings
-            names_with = [a.fullname for a in accounts_with]
-            assert any("Checking" in n for n in names_with)
-            assert any("Savings" in n for n in names_with)
+        # With subtree should include Checking and Savings
+        names_with = [a.fullname for a in accounts_with]
+        assert any("Checking" in n for n in names_with)
+        assert any("Savings" in n for n in names_with)
 
-            # Without subtree should only have Bank itself
-            names_without = [a.fullname for a in accounts_without]
-            assert len(names_without) == 1
-            assert names_without[0].endswith("Bank")
+        # Without subtree should only have Bank itself
+        names_without = [a.fullname for a in accounts_without]
+        assert len(names_without) == 1
+        assert names_without[0].endswith("Bank")
 
-    def test_find_account_regex(self, test_book_path):
+    def test_find_account_regex(self, opened_book):
         """Should support regex patterns."""
-        from gcg.book import get_account_by_pattern, open_gnucash_book
-
-        with open_gnucash_book(test_book_path) as (book, info):
-            # Match accounts containing "Checking" or "Savings"
-            accounts = get_account_by_pattern(
-                book,
-                "(Checking|Savings)",
-                is_regex=True,
-                include_subtree=False,
-            )
-            names = [a.fullname for a in accounts]
-            assert any("Checking" in n for n in names)
-            assert any("Savings" in n for n in names)
+        from gcg.book import get_account_by_pattern
+
+        book, info = opened_book
+        # Match accounts containing "Checking" or "Savings"
+        accounts = get_account_by_pattern(
+            book,
+            "(Checking|Savings)",
+            is_regex=True,
+            include_subtree=False,
+        )
+        names = [a.fullname for a in accounts]
+        assert any("Checking" in n for n in names)
+        assert any("Savings" in n for n in names)
 
-    def test_invalid_regex_raises(self, test_book_path):
+    def test_invalid_regex_raises(self, opened_book):
         """Invalid regex should raise InvalidPatternError."""
-        from gcg.book import (
-            InvalidPatternError,
-            get_account_by_pattern,
-            open_gnucash_book,
-        )
+        from gcg.book import InvalidPatternError, get_account_by_pattern
 
-        with open_gnucash_book(test_book_path) as (book, info):
-            with pytest.raises(InvalidPatternError):
-                get_account_by_pattern(book, "[invalid", is_regex=True)
+        book, info = opened_book
+        with pytest.raises(InvalidPatternError):
+            get_account_by_pattern(book, "[invalid", is_regex=True)
 
 
 class TestGrepCommand:
     """Tests for grep search functionality."""
 
-    def test_grep_finds_transaction(self, config_with_test_book):
-        """grep should find transactions by description."""
+    @pytest.mark.parametrize(
+        "argv, expected_rc",
+        [
+            pytest.param(["grep", "Tesco"], 0, id="description"),
+            pytest.param(["grep", "nonexistent12345"], 1, id="no-matches"),
+            pytest.param(
+                ["grep", ".", "--regex", "--after", "2026-01-15"],
+                0,
+                id="date-filter",
+            ),
+            pytest.param(
+                ["grep", ".", "--regex", "--amount", "80..130"],
+                0,
+                id="amount-filter",
+            ),
+            # Case-insensitive by default, so "TESCO" still finds "Tesco"
+            pytest.param(["grep", "TESCO"], 0, id="case-insensitive"),
+            # Only the selected fields are searched
+            pytest.param(["grep", "Weekly", "--in", "memo"], 0, id="in-memo"),
+            pytest.param(["grep", "Weekly", "--in", "desc"], 1, id="in-desc"),
+            # A match must fall within a single field: "Amazon Fresh
+            # delivery" has the memo "Weekly groceries"
+            pytest.param(
+                ["grep", "delivery Weekly"], 1, id="not-across-fields"
+            ),
+        ],
+    )
+    def test_grep_exit_code(self, config_with_test_book, argv, expected_rc):
+        """grep should return 0 when it finds matches and 1 otherwise."""
         from gcg.cli import cmd_grep, create_parser
 
-        parser = create_parser()
-        args = parser.parse_args(["grep", "Tesco"])
-        result = cmd_grep(args, config_with_test_book)
-        assert result == 0  # Found matches
-
-    def test_grep_no_matches(self, config_with_test_book):
-        """grep should return 1 when no matches found."""
-        from gcg.cli import cmd_grep, create_parser
+        args = create_parser().parse_args(argv)
+        assert cmd_grep(args, config_with_test_book) == expected_rc
 
-        parser = create_parser()
-        args = parser.parse_args(["grep", "nonexistent12345"])
-        result = cmd_grep(args, config_with_test_book)
-        assert result == 1  # No matches
-
-    def test_grep_with_date_filter(self, config_with_test_book):
-        """grep should filter by date."""
-        from gcg.cli import cmd_grep, create_parser
-
-        parser = create_parser()
-        # Only January 15 onwards
-        args = parser.parse_args(
-            ["grep", ".", "--regex", "--after", "2026-01-15"]
-        )
-        result = cmd_grep(args, config_with_test_book)
-        assert result == 0
+    def test_grep_account_filter(self, config_with_test_book):
+        """grep --account should only return splits in those accounts."""
+        import json
 
-    def test_grep_with_amount_filter(self, config_with_test_book):
-        """grep should filter by amount."""
         from gcg.cli import cmd_grep, create_parser
 
         parser = create_parser()
-        # Amounts between 80 and 130
         args = parser.parse_args(
-            ["grep", ".", "--regex", "--amount", "80..130"]
+            ["--format", "json", "grep", ".", "--regex", "--account", "Food"]
         )
-        result = cmd_grep(args, config_with_test_book)
-        assert result == 0
-
-    def test_grep_case_insensitive(self, config_with_test_book):
-        """grep should be case-insensitive by default."""
-        from gcg.cli import cmd_grep, create_parser
-
-        parser = create_parser()
-        args = parser.parse_args(["grep", "TESCO"])
-        result = cmd_grep(args, config_with_test_book)
-        assert result == 0  # Should still find "Tesco"
+        captured = io.StringIO()
+        with redirect_stdout(captured):
+            assert cmd_grep(args, config_with_test_book) == 0
+        accounts = {row["account"] for row in json.loads(captured.getvalue())}
+        assert accounts == {"Groceries", "Restaurants"}
 
 
 class TestLedgerCommand:
     """Tests for ledger command."""
 
-    def test_ledger_account(self, config_with_test_book):
-        """ledger should display splits for an account."""
+    @pytest.mark.parametrize(
+        "argv, expected_rc",
+        [
+            pytest.param(["ledger", "Checking"], 0, id="account"),
+            pytest.param(
+                ["ledger", "NonexistentAccount123"], 1, id="no-match"
+            ),
+            pytest.param(
+                ["ledger", "Checking", "--date", "2026-01-01..2026-01-31"],
+                0,
+                id="date-range",
+            ),
+        ],
+    )
+    def test_ledger_exit_code(self, config_with_test_book, argv, expected_rc):
+        """ledger should return 1 when no account matches."""
         from gcg.cli import cmd_ledger, create_parser
 
-        parser = create_parser()
-        args = parser.parse_args(["ledger", "Checking"])
-        result = cmd_ledger(args, config_with_test_book)
-        assert result == 0
+        args = create_parser().parse_args(argv)
+        assert cmd_ledger(args, config_with_test_book) == expected_rc
 
-    def test_ledger_no_match(self, config_with_test_book):
-        """ledger should return 1 for non-existent account."""
-        from gcg.cli import cmd_ledger, create_parser
 
-        parser = create_parser()
-        args = parser.parse_args(["ledger", "NonexistentAccount123"])
-        result = cmd_ledger(args, config_with_test_book)
-        assert result == 1
+class TestDispatch:
+    """Tests for routing parsed commands to their handlers."""
 
-    def test_ledger_with_date_range(self, config_with_test_book):
-        """ledger should respect date filters."""
-        from gcg.cli import cmd_ledger, create_parser
+    def test_dispatch_runs_command(self, config_with_test_book):
+        """A parsed command should run its handler."""
+        from argparse import Namespace
 
-        parser = create_parser()
-        args = parser.parse_args(
-            ["ledger", "Checking", "--date", "2026-01-01..2026-01-31"]
-        )
-        result = cmd_ledger(args, config_with_test_book)
-        assert result == 0
+        from gcg.cli import _dispatch, create_parser
+
+        args = create_parser().parse_args(["accounts", "Bank"])
+        captured = io.StringIO()
+        with redirect_stdout(captured):
+            assert _dispatch(args, config_with_test_book) == 0
+        assert "Bank" in captured.getvalue()
+
+        unknown = Namespace(command="bogus")
+        assert _dispatch(unknown, config_with_test_book) == 2
 
 
 class TestDoctorCommand:
@@ -278,6 +295,19 @@ class TestNotesLookup:
         )
         assert result == {}
 
+    def test_batch_notes_failure_on_passed_connection(self, test_book_path):
+        """A failed query on a passed-in connection should raise."""
+        import sqlite3
+
+        from gcg.book import get_transaction_notes_batch
+
+        conn = sqlite3.connect(":memory:")
+        conn.close()
+        with pytest.raises(sqlite3.Error):
+            get_transaction_notes_batch(
+                test_book_path, ["some-guid"], False, conn=conn
+            )
+
 
 class TestOutputFormats:
     """Tests for different output formats."""
@@ -303,6 +333,55 @@ class TestOutputFormats:
         assert isinstance(data, list)
         assert len(data) > 0
 
+    def test_full_tx_json_output(self, config_with_test_book):
+        """--full-tx should list each transaction once with all splits."""
+        import json
+
+        from gcg.cli import cmd_grep, create_parser
+
+        parser = create_parser()
+        args = parser.parse_args(
+            ["--format", "json", "grep", ".", "--regex", "--full-tx"]
+        )
+        captured = io.StringIO()
+        with redirect_stdout(captured):
+            assert cmd_grep(args, config_with_test_book) == 0
+
+        data = json.loads(captured.getvalue())
+        assert len({tx["tx_guid"] for tx in data}) == len(data) == 6
+        for tx in data:
+            split_guids = [s["split_guid"] for s in tx["splits"]]
+            assert len(split_guids) == len(set(split_guids)) >= 2
+
+    def test_full_tx_balanced_context(self, config_with_test_book):
+        """--context balanced should show splits that sum to zero."""
+        import json
+        from decimal import Decimal
+
+        from gcg.cli import cmd_grep, create_parser
+
+        parser = create_parser()
+        args = parser.parse_args(
+            [
+                "--format",
+                "json",
+                "grep",
+                "Tesco",
+                "--full-tx",
+                "--context",
+                "balanced",
+                "--signed",
+            ]
+        )
+        captured = io.StringIO()
+        with redirect_stdout(captured):
+            assert cmd_grep(args, config_with_test_book) == 0
+
+        data = json.loads(captured.getvalue())
+        assert data
+        for tx in data:
+            assert sum(Decimal(s["amount"]) for s in tx["splits"]) == 0
+
     def test_csv_output(self, config_with_test_book):
         """Should produce valid CSV output."""
         from gcg.cli import cmd_grep, create_parser
@@ -321,3 +400,227 @@ class TestOutputFormats:
         assert len(lines) >= 2
         # Header should have columns
         assert "," in lines[0]
+
+
+class TestReplCompleter:
+    """Tests for REPL command completion."""
+
+    def test_completes_matching_commands(self):
+        """Completer should yield each match, then None."""
+        from gcg.repl import _Completer
+
+        complete = _Completer(["split", "set", "grep", "save"])
+        assert [complete("s", i) for i in range(4)] == [
+            "save",
+            "set",
+            "split",
+            None,
+        ]
+        assert complete("g", 0) == "grep"
+        assert complete("x", 0) is None
+
+
+@pytest.fixture(scope="module")
+def shared_session(test_book_path):
+    """
+    One JSON-mode REPL session shared by read-only lookups.
+
+    Tests that close the book or inspect its caches take the
+    function-scoped session instead.
+    """
+    from gcg.config import Config
+    from gcg.repl import ReplSession
+
+    session = ReplSession(Config(book_path=test_book_path))
+    with redirect_stdout(io.StringIO()):
+        assert session.open_book()
+    session.output_format = "json"
+    yield session
+    session.close_book()
+
+
+class TestReplSession:
+    """Tests for REPL commands against an open book."""
+
+    @pytest.fixture
+    def session(self, config_with_test_book):
+        """A REPL session with the test book open, in JSON mode."""
+        from gcg.repl import ReplSession
+
+        session = ReplSession(config_with_test_book)
+        with redirect_stdout(io.StringIO()):
+            assert session.open_book()
+        session.output_format = "json"
+        yield session
+        session.close_book()
+
+    def _run(self, session, line):
+        import json
+
+        captured = io.StringIO()
+        with redirect_stdout(captured):
+            session.run_command(line)
+        return json.loads(captured.getvalue())
+
+    def test_tx_lookup_by_guid(self, shared_session):
+        """tx should find a transaction by GUID."""
+        tx = shared_session.book.transactions[0]
+        data = self._run(shared_session, f"tx {tx.guid}")
+        assert [t["tx_guid"] for t in data] == [tx.guid]
+        assert len(data[0]["splits"]) == len(tx.splits)
+
+    def test_split_lookup_by_guid(self, shared_session):
+        """split should find a split by GUID."""
+        split = shared_session.book.transactions[0].splits[0]
+        data = self._run(shared_session, f"split {split.guid}")
+        assert [s["split_guid"] for s in data] == [split.guid]
+        assert data[0]["tx_guid"] == split.transaction.guid
+
+    def test_unknown_guid(self, shared_session, capsys):
+        """Unknown GUIDs should be reported, not raise."""
+        shared_session.run_command("tx nonexistent")
+        shared_session.run_command("split nonexistent")
+        err = capsys.readouterr().err
+        assert "Transaction not found: nonexistent" in err
+        assert "Split not found: nonexistent" in err
+
+    def test_grep_date_bounds(self, shared_session):
+        """--after is inclusive and --before is exclusive."""
+        data = self._run(
+            shared_session,
+            "grep . --regex --after 2026-01-10 --before 2026-01-20",
+        )
+        assert {row["date"] for row in data} == {"2026-01-10", "2026-01-15"}
+
+    def test_grep_full_tx(self, shared_session):
+        """grep --full-tx should list each transaction once."""
+        data = self._run(shared_session, "grep . --regex --full-tx")
+        assert len({tx["tx_guid"] for tx in data}) == len(data) == 6
+        for tx in data:
+            split_guids = [s["split_guid"] for s in tx["splits"]]
+            assert len(split_guids) == len(set(split_guids)) >= 2
+
+    def test_repeated_commands_do_not_share_options(self, shared_session):
+        """Options from one command should not leak into the next."""
+        first = self._run(shared_session, "grep Tesco --limit 1")
+        second = self._run(shared_session, "grep Tesco")
+        assert len(first) == 1
+        assert len(second) > 1
+
+    def test_command_dispatch(self, config_with_test_book, capsys):
+        """Commands should dispatch by name, checking for an open book."""
+        from gcg.repl import ReplSession
+
+        session = ReplSession(config_with_test_book)
+        session.run_command("grep Tesco")
+        session.run_command("frobnicate")
+        err = capsys.readouterr().err
+        assert "No book open" in err
+        assert "Unknown command: frobnicate" in err
+
+        session.run_command("QUIT")
+        assert session.running is False
+
+    def test_save_history_appends_new_entries(
+        self, config_with_test_book, tmp_path
+    ):
+        """Only entries added since the last save should be written."""
+        import readline
+
+        from gcg.repl import ReplSession
+
+        config_with_test_book.history_path = tmp_path / "gcg" / "history"
+        readline.clear_history()
+        session = ReplSession(config_with_test_book)
+        session.setup_readline()
+
+        readline.add_history("accounts Bank")
+        session.save_history()
+        readline.add_history("grep Tesco")
+        session.save_history()
+        session.save_history()
+
+        lines = session.history_path.read_text().splitlines()
+        assert lines == ["accounts Bank", "grep Tesco"]
+        readline.clear_history()
+
+    def test_notes_fetched_once_per_transaction(self, session, monkeypatch):
+        """Repeated queries should reuse notes already read."""
+        import gcg.repl
+
+        requested = []
+        fetch = gcg.repl.get_transaction_notes_batch
+
+        def counting_fetch(db_path, tx_guids, has_notes_column, conn=None):
+            requested.extend(tx_guids)
+            return fetch(db_path, tx_guids, has_notes_column, conn=conn)
+
+        monkeypatch.setattr(
+            gcg.repl, "get_transaction_notes_batch", counting_fetch
+        )
+        first = self._run(session, "ledger Checking")
+        fetched = len(requested)
+        second = self._run(session, "ledger Checking")
+        assert first == second
+        assert fetched > 0
+        assert len(requested) == fetched
+
+    def test_notes_retried_after_failed_query(self, session):
+        """A failed notes query should not hide notes for later calls."""
+        import sqlite3
+
+        tx = session.book.transactions(description="Monthly salary")
+        broken = sqlite3.connect(":memory:")
+        broken.close()
+        session._notes_conn = broken
+        assert session._get_notes([tx.guid]) == {}
+        assert tx.guid not in session._notes_cache
+        assert session._notes_conn is None
+
+        assert session._get_notes([tx.guid]) == {tx.guid: "January payslip"}
+
+    def test_notes_connection_closed_with_book(self, session):
+        """The notes connection should be reused, then closed with the book."""
+        self._run(session, "ledger Checking")
+        conn = session._notes_conn
+        assert conn is not None
+        self._run(session, "grep Tesco")
+        assert session._notes_conn is conn
+
+        session.close_book()
+        assert session._notes_conn is None
+
+    def test_accounts_tree_prune(self, shared_session):
+        """accounts --tree-prune should keep ancestors and descendants."""
+        data = self._run(shared_session, "accounts Bank --tree --tree-prune")
+        names = {a["name"] for a in data}
+        assert {"Assets", "Assets:Bank", "Assets:Bank:Checking"} <= names
+        assert not any(n.startswith("Expenses") for n in names)
+
+
+class TestCacheSearch:
+    """Tests for searching the sidecar cache."""
+
+    def test_search_fts_and_like(self, built_cache):
+        """FTS and LIKE searches should find the same splits."""
+        fts = built_cache.search("Tesco")
+        like = built_cache.search("tesco", use_fts=False)
+        assert fts
+        assert {r["split_guid"] for r in fts} == {
+            r["split_guid"] for r in like
+        }
+
+    def test_search_limit(self, built_cache):
+        """limit should cap the number of rows returned."""
+        assert len(built_cache.search("Tesco", limit=1)) == 1
+        assert len(built_cache.search("Tesco")) > 1
+
+    def test_search_reuses_connection(self, built_cache):
+        """Repeated searches should share one connection until dropped."""
+        built_cache.search("Tesco")
+        conn = built_cache._search_conn
+        built_cache.search("Tesco", use_fts=False)
+        assert built_cache._search_conn is conn
+
+        assert built_cache.drop()
+        assert built_cache._search_conn is None
@@ -1,5 +1,6 @@
 """Tests for output formatting."""
 
+import csv
 import io
 import json
 from datetime import date
@@ -11,8 +12,12 @@ from gcg.output import (
     AccountRow,
     OutputFormatter,
     SplitRow,
+    TransactionRow,
+    OUTPUT_CHUNK_ROWS,
+    _ChunkedWriter,
     _truncate,
     _format_amount,
+    _write_json_array,
 )
 
 
@@ -45,11 +50,43 @@ class TestHelperFunctions:
         result = _format_amount(Decimal("-1234.56"))
         assert result == "-1,234.56"
 
+    def test_format_amount_zero(self):
+        """Zero, including negative zero, should format as 0.00."""
+        assert _format_amount(Decimal("0")) == "0.00"
+        assert _format_amount(Decimal("-0.00")) == "0.00"
+
     def test_format_amount_none(self):
         """None should return empty string."""
         result = _format_amount(None)
         assert result == ""
 
+    def test_chunked_writer_flushes_in_chunks(self):
+        """Buffered text should reach the file once the chunk fills."""
+        output = io.StringIO()
+        with _ChunkedWriter(output, chunk_size=10) as out:
+            out.write("abcd")
+            assert output.getvalue() == ""
+            out.write("efghijk")
+            assert output.getvalue() == "abcdefghijk"
+            out.write("tail")
+        assert output.getvalue() == "abcdefghijktail"
+
+    def test_write_json_array_streams_generator(self):
+        """Generators should be encoded lazily, batch by batch."""
+        output = io.StringIO()
+        written_before_end = []
+
+        def items():
+            for i in range(OUTPUT_CHUNK_ROWS + 1):
+                yield {"n": i}
+            written_before_end.append(output.tell())
+
+        _write_json_array(items(), output)
+        assert written_before_end[0] > 0
+        assert json.loads(output.getvalue()) == [
+            {"n": i} for i in range(OUTPUT_CHUNK_ROWS + 1)
+        ]
+
 
 class TestSplitRow:
     """Tests for SplitRow data class."""
@@ -182,6 +219,54 @@ class TestOutputFormatter:
         assert result[0]["description"] == "Amazon Purchase"
         assert result[1]["amount"] == "25.50"
 
+    def test_format_splits_json_matches_json_dump(self, sample_splits):
+        """Streamed JSON should match a plain json.dump of the rows."""
+        sample_splits[1].description = "Café ü"
+        formatter = OutputFormatter(format_type="json")
+        output = io.StringIO()
+        formatter.format_splits(sample_splits, file=output)
+
+        expected = json.dumps(
+            [row.to_dict() for row in sample_splits],
+            indent=2,
+            ensure_ascii=False,
+        )
+        assert output.getvalue() == expected + "\n"
+
+    def test_format_transactions_table(self, sample_splits):
+        """Transaction blocks should list each split under its header."""
+        tx_rows = [
+            TransactionRow(
+                tx_guid="tx-1",
+                date=date(2026, 1, 15),
+                description="Amazon Purchase",
+                notes="Gift",
+                splits=sample_splits,
+            ),
+            TransactionRow(
+                tx_guid="tx-2",
+                date=date(2026, 1, 16),
+                description="Refund",
+                notes=None,
+                splits=[],
+            ),
+        ]
+        formatter = OutputFormatter(format_type="table")
+        output = io.StringIO()
+        formatter.format_transactions(tx_rows, file=output)
+
+        assert output.getvalue().splitlines() == [
+            "[2026-01-15] Amazon Purchase",
+            "  Notes: Gift",
+            "  GUID: tx-1",
+            f"    {'Expenses:Shopping':<40} {'50.00':>12} EUR",
+            "      Memo: Order #123",
+            f"    {'Expenses:Food':<40} {'25.50':>12} EUR",
+            "",
+            "[2026-01-16] Refund",
+            "  GUID: tx-2",
+        ]
+
     def test_format_splits_csv(self, sample_splits):
         """CSV output should have header and rows."""
         formatter = OutputFormatter(format_type="csv")
@@ -202,6 +287,55 @@ class TestOutputFormatter:
         lines = output.getvalue().strip().split("\n")
         assert len(lines) == 2  # No header, just data
 
+    def test_format_splits_csv_values(self, sample_splits):
+        """CSV rows should render dates, amounts and empty memos."""
+        sample_splits[0].fx_rate = Decimal("0.85")
+        sample_splits[0].amount_orig = Decimal("58.82")
+        sample_splits[0].currency_orig = "GBP"
+        formatter = OutputFormatter(format_type="csv")
+        output = io.StringIO()
+        formatter.format_splits(sample_splits, file=output)
+
+        lines = output.getvalue().splitlines()
+        assert lines[0] == (
+            "date,description,account,memo,amount,currency,fx_rate,"
+            "tx_guid,split_guid,amount_orig,currency_orig"
+        )
+        assert lines[1] == (
+            "2026-01-15,Amazon Purchase,Expenses:Shopping,Order #123,"
+            "50.00,EUR,0.85,tx-1,split-1,58.82,GBP"
+        )
+        assert lines[2] == (
+            "2026-01-16,Grocery Store,Expenses:Food,,25.50,EUR,,"
+            "tx-2,split-2,,"
+        )
+
+    def test_format_splits_csv_without_original(self, sample_splits):
+        """include_original=False should skip original-amount columns."""
+        sample_splits[0].amount_orig = Decimal("58.82")
+        sample_splits[0].currency_orig = "GBP"
+        formatter = OutputFormatter(
+            format_type="csv", include_notes=False, include_original=False
+        )
+        output = io.StringIO()
+        formatter.format_splits(sample_splits, file=output)
+
+        header = output.getvalue().splitlines()[0]
+        assert "amount_orig" not in header
+        assert "notes" not in header
+
+    def test_format_splits_csv_quotes_special_fields(self, sample_splits):
+        """Fields with commas, quotes or newlines should still be quoted."""
+        sample_splits[0].description = 'Say "hi", then\nleave'
+        formatter = OutputFormatter(format_type="csv", show_header=False)
+        output = io.StringIO()
+        formatter.format_splits(sample_splits, file=output)
+
+        parsed = list(csv.reader(io.StringIO(output.getvalue())))
+        assert len(parsed) == 2
+        assert parsed[0][1] == 'Say "hi", then\nleave'
+        assert parsed[1][1] == "Grocery Store"
+
     def test_format_empty_splits(self):
         """Empty split list should produce no output."""
         formatter = OutputFormatter(format_type="json")
@@ -209,6 +343,48 @@ class TestOutputFormatter:
         formatter.format_splits([], file=output)
         assert output.getvalue() == ""
 
+    def test_format_splits_table(self, sample_splits):
+        """Table output should keep formatted, right-aligned amounts."""
+        sample_splits[1].amount = Decimal("-1234.5")
+        formatter = OutputFormatter(format_type="table")
+        output = io.StringIO()
+        formatter.format_splits(sample_splits, file=output)
+
+        lines = output.getvalue().splitlines()
+        assert len(lines) == 4  # Header + rule + 2 data rows
+        assert lines[0].startswith("Date")
+        assert set(lines[1]) == {"-", " "}
+        assert lines[2].endswith("    50.00  EUR")
+        assert lines[3].endswith("-1,234.50  EUR")
+
+    def test_format_splits_table_truncates_long_text(self, sample_splits):
+        """Long descriptions and memos should be cut with an ellipsis."""
+        sample_splits[0].description = "D" * 50
+        sample_splits[0].memo = "M" * 30
+        formatter = OutputFormatter(format_type="table", show_header=False)
+        output = io.StringIO()
+        formatter.format_splits(sample_splits, file=output)
+
+        first = output.getvalue().splitlines()[0]
+        assert "D" * 37 + "..." in first
+        assert "D" * 38 not in first
+        assert "M" * 22 + "..." in first
+
+    def test_format_accounts_table_tree(self):
+        """Tree mode should indent child accounts by depth."""
+        rows = [
+            AccountRow(name="Assets", type="ASSET", currency="EUR"),
+            AccountRow(
+                name="Assets:Bank", type="BANK", currency="EUR", depth=1
+            ),
+        ]
+        formatter = OutputFormatter(format_type="table", show_header=False)
+        output = io.StringIO()
+        formatter.format_accounts(rows, tree_mode=True, file=output)
+
+        lines = output.getvalue().splitlines()
+        assert lines == ["Assets  ASSET  EUR", "  Bank  BANK   EUR"]
+
     @pytest.fixture
     def sample_accounts(self):
         """Create sample account rows for testing."""
@@ -226,3 +402,16 @@ class TestOutputFormatter:
         result = json.loads(output.getvalue())
         assert len(result) == 2
         assert result[0]["name"] == "Assets:Bank"
+
+    def test_format_accounts_csv_with_guids(self, sample_accounts):
+        """Account CSV should include GUIDs only when requested."""
+        sample_accounts[0].guid = "acc-1"
+        output = io.StringIO()
+        OutputFormatter(format_type="csv", show_guids=True).format_accounts(
+            sample_accounts, file=output
+        )
+        assert output.getvalue().splitlines() == [
+            "name,type,currency,guid",
+            "Assets:Bank,BANK,EUR,acc-1",
+            "Assets:Cash,CASH,EUR,",
+        ]